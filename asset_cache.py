@@ -0,0 +1,297 @@
+
+# A process-wide cache of decoded images. Every world and script fetches its surfaces through
+# here so that a png used in several places (character sprites, switch tiles...) is decoded once
+# and the same surface is shared instead of duplicated in memory.
+
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+from os import environ
+from os.path import normpath
+
+import pygame
+
+from startup import timer, load_scene_phase
+
+# how the decoded image is converted to the display format
+CONVERT = "convert"
+CONVERT_ALPHA = "convert_alpha"
+NO_CONVERT = "none"
+
+# the default memory budget of the cache, in bytes
+DEFAULT_MAX_BYTES = 192 * 1024 * 1024
+
+# Debug mode that reports images, sounds and music being read from inside a script callback,
+# which means the file was missing from the world's manifest or wasn't preloaded. Set the
+# environment variable to "log" or "raise" before the worlds are imported.
+IO_DEBUG = environ.get("LUMINESCENCE_IO_DEBUG", "")
+
+logger = logging.getLogger(__name__)
+
+
+class FrameIOError(RuntimeError):
+    pass
+
+
+# Applies a single transform description to a surface. Transforms are tuples so that they can be
+# part of the cache key:
+#   ("flip", flip_x, flip_y)
+#   ("scale", width, height)
+#   ("smoothscale", width, height)
+#   ("rotate", degrees)
+def apply_transform(surface, transform):
+    name = transform[0]
+
+    if name == "flip":
+        return pygame.transform.flip(surface, transform[1], transform[2])
+
+    elif name == "scale":
+        return pygame.transform.scale(surface, (transform[1], transform[2]))
+
+    elif name == "smoothscale":
+        return pygame.transform.smoothscale(surface, (transform[1], transform[2]))
+
+    elif name == "rotate":
+        return pygame.transform.rotate(surface, transform[1])
+
+    raise ValueError("unknown image transform: " + str(name))
+
+
+# the amount of memory held by the pixels of a surface
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetCache(object):
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+
+        # entries that can be evicted, least recently used at the front
+        self.entries = OrderedDict()
+
+        # entries that are never evicted, such as the ones in world manifests, and their size
+        self.pinned = dict()
+        self.pinned_size = 0
+
+        # how many script callbacks and scene loads we are currently inside of
+        self.callback_depth = 0
+        self.loading_depth = 0
+
+        # the budget, and the bytes of the entries that can be evicted
+        self.max_bytes = max_bytes
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # seconds spent decoding and converting images
+        self.decode_time = 0.0
+
+    # Returns the surface for the image at the path, decoding it only if it is not cached yet.
+    def get_image(self, path, mode=CONVERT_ALPHA, transforms=()):
+        path = normpath(path)
+        transforms = tuple(transforms)
+        key = (path, mode, transforms)
+
+        surface = self.pinned.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        surface = self.entries.pop(key, None)
+
+        # re-insert to mark the entry as the most recently used
+        if surface is not None:
+            self.hits += 1
+            self.entries[key] = surface
+            return surface
+
+        self.misses += 1
+
+        # transformed images are built from the cached original
+        if transforms:
+            surface = self.get_image(path, mode)
+            for transform in transforms:
+                surface = apply_transform(surface, transform)
+
+        else:
+            surface = self.decode(path, mode)
+
+        self.insert(key, surface)
+        return surface
+
+    def decode(self, path, mode):
+        self.check_frame_io(path)
+
+        start = time.time()
+        surface = self.convert(pygame.image.load(path), mode)
+
+        self.decode_time += time.time() - start
+        return surface
+
+    def convert(self, surface, mode):
+        if mode == CONVERT:
+            return surface.convert()
+
+        elif mode == CONVERT_ALPHA:
+            return surface.convert_alpha()
+
+        return surface
+
+    # Adds an image that was decoded somewhere else, such as on a loader thread. It only has to be
+    # converted to the display format, which must happen on the main thread.
+    def add_decoded(self, path, mode, surface):
+        key = manifest_key(path, mode)
+        if key in self.entries or key in self.pinned:
+            return
+
+        start = time.time()
+        surface = self.convert(surface, mode)
+        self.decode_time += time.time() - start
+
+        self.insert(key, surface)
+
+    # disk access from a frame callback, scene loading is allowed to hit the disk
+    def check_frame_io(self, path, access="image decoded"):
+        if self.callback_depth > 0 and self.loading_depth == 0:
+            self.report_frame_io(path, access)
+
+    def report_frame_io(self, path, access="image decoded"):
+        message = access + " inside a script callback: " + path
+
+        if IO_DEBUG == "raise":
+            raise FrameIOError(message)
+
+        logger.warning(message)
+
+    def insert(self, key, surface):
+        self.entries[key] = surface
+        self.size += surface_bytes(surface)
+
+        # evict the least recently used surfaces, but never the one that was just added
+        while self.size + self.pinned_size > self.max_bytes and len(self.entries) > 1:
+            old_key, old_surface = self.entries.popitem(last=False)
+            self.size -= surface_bytes(old_surface)
+            self.evictions += 1
+
+    # Moves the entry out of the ones that can be evicted. Its bytes still count towards the budget,
+    # pinning more than the budget leaves no room for the other images and is reported once.
+    def pin(self, key):
+        surface = self.entries.pop(key, None)
+        if surface is None:
+            return
+
+        self.size -= surface_bytes(surface)
+        self.pinned[key] = surface
+
+        was_within = self.pinned_size <= self.max_bytes
+        self.pinned_size += surface_bytes(surface)
+
+        if was_within and self.pinned_size > self.max_bytes:
+            logger.warning("pinned images take %d bytes, more than the cache's budget of %d bytes",
+                           self.pinned_size, self.max_bytes)
+
+    def contains(self, path, mode=CONVERT_ALPHA, transforms=()):
+        key = manifest_key(path, mode, transforms)
+        return key in self.entries or key in self.pinned
+
+    # Decodes a list of images ahead of time. Each item is either a path, which uses the
+    # default convert mode, or a (path, mode) / (path, mode, transforms) tuple.
+    # Pinned images stay in memory regardless of the byte budget.
+    def preload(self, items, pin=False):
+        for item in items:
+            if not isinstance(item, tuple):
+                item = (item,)
+
+            self.get_image(*item)
+
+            if pin:
+                self.pin(manifest_key(*item))
+
+    def clear(self):
+        self.entries.clear()
+        self.pinned.clear()
+        self.size = 0
+        self.pinned_size = 0
+
+    def stats(self):
+        return {"entries": len(self.entries) + len(self.pinned),
+                "bytes": self.size + self.pinned_size,
+                "pinned bytes": self.pinned_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "decode_time": self.decode_time}
+
+
+def manifest_key(path, mode=CONVERT_ALPHA, transforms=()):
+    return normpath(path), mode, tuple(transforms)
+
+
+# the cache shared by the whole game
+cache = AssetCache()
+
+
+def load_image(path, mode=CONVERT_ALPHA, transforms=()):
+    return cache.get_image(path, mode, transforms)
+
+
+def preload_images(items):
+    cache.preload(items)
+
+
+# for the other assets read from disk, such as sounds and music
+def check_frame_io(path, access):
+    cache.check_frame_io(path, access)
+
+
+# Decorator for World.load_scene. It decodes and pins every image in the world's asset_manifest
+# before the scene is built, so that the scripts of the world only ever get cache hits.
+# The time the scene took to load is recorded in the startup timings.
+def loads_manifest(load_scene):
+
+    @wraps(load_scene)
+    def load_scene_with_manifest(world):
+        cache.loading_depth += 1
+        try:
+            with timer.phase(load_scene_phase(world)):
+                cache.preload(world.asset_manifest, pin=True)
+                return load_scene(world)
+        finally:
+            cache.loading_depth -= 1
+
+    return load_scene_with_manifest
+
+
+def guard_callback(callback):
+
+    @wraps(callback)
+    def guarded(*args, **kwargs):
+        cache.callback_depth += 1
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            cache.callback_depth -= 1
+
+    guarded.frame_io_guarded = True
+    return guarded
+
+
+# Class decorator for scripts. When the io debug mode is on, the frame callbacks of the script
+# report any image that has to be decoded from disk while they run, including the callbacks it
+# inherits. Otherwise the class is returned untouched so there is no cost in normal play.
+def frame_io_guard(script_class):
+    if not IO_DEBUG:
+        return script_class
+
+    for name in ("update", "collision_event", "take_input"):
+        for cls in script_class.__mro__:
+            if name in vars(cls):
+                callback = vars(cls)[name]
+                if not getattr(callback, "frame_io_guarded", False):
+                    setattr(script_class, name, guard_callback(callback))
+                break
+
+    return script_class
@@ -0,0 +1,50 @@
+
+# Runtime side of the animation atlas. The frames of the animation directories are packed into a
+# single image by pack_atlas.py, along with a json index of the rectangle of every frame. Loading
+# an animation then hands out subsurfaces of that one image instead of opening every frame file.
+
+import json
+from os.path import dirname, isfile, join, normpath
+
+from asset_cache import load_image
+
+# index written by pack_atlas.py
+ATLAS_INDEX = "assets/animations/atlas.json"
+
+# the parsed index and the atlas surface, loaded on first use
+_atlas = dict()
+
+
+def atlas_key(dir_path):
+    return normpath(dir_path).replace("\\", "/")
+
+
+def load_atlas(index_path=ATLAS_INDEX):
+    if index_path in _atlas:
+        return _atlas[index_path]
+
+    atlas = None
+    if isfile(index_path):
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+
+        image = load_image(join(dirname(index_path), index["image"]))
+        atlas = (image, index["animations"])
+
+    _atlas[index_path] = atlas
+    return atlas
+
+
+# Returns the frames of the animation directory as subsurfaces of the atlas, or None if there is
+# no atlas or the directory was not packed into it.
+def atlas_frames(dir_path, index_path=ATLAS_INDEX):
+    atlas = load_atlas(index_path)
+    if atlas is None:
+        return None
+
+    image, animations = atlas
+    rects = animations.get(atlas_key(dir_path))
+    if rects is None:
+        return None
+
+    return [image.subsurface(rect) for rect in rects]
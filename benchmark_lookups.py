@@ -0,0 +1,67 @@
+
+# Compares the lookups of entity_index against the linear searches they replace:
+#
+#   python benchmark_lookups.py [entity count]
+
+import sys
+import timeit
+
+from entity_index import TagIndex, ScriptHandle
+
+
+# Times looking up the last tagged entity of a world of the given size with a linear search and
+# with the index, and a script by name among the scripts of an entity. Prints seconds per lookup.
+def benchmark(entity_count=1000, script_count=8, repeat=20000):
+
+    class Entity(object):
+        def __init__(self, tag):
+            self.tag = tag
+            self.scripts = [Script("script " + str(i)) for i in range(script_count)]
+
+        def get_script(self, name):
+            for script in self.scripts:
+                if script.name == name:
+                    return script
+            return None
+
+    class Script(object):
+        def __init__(self, name):
+            self.name = name
+
+    class EntityManager(object):
+        def __init__(self):
+            self.entities = [Entity("tag " + str(i)) for i in range(entity_count)]
+
+    class World(object):
+        def __init__(self):
+            self.entity_manager = EntityManager()
+
+        def get_entity_by_tag(self, tag):
+            for entity in self.entity_manager.entities:
+                if entity.tag == tag:
+                    return entity
+            return None
+
+    world = World()
+    index = TagIndex(world)
+    tag = "tag " + str(entity_count - 1)
+
+    entity = world.entity_manager.entities[-1]
+    name = "script " + str(script_count - 1)
+    handle = ScriptHandle(name, entity)
+
+    results = [("get_entity_by_tag", lambda: world.get_entity_by_tag(tag)),
+               ("TagIndex.first", lambda: index.first(tag)),
+               ("get_script", lambda: entity.get_script(name)),
+               ("ScriptHandle.get", handle.get)]
+
+    for label, lookup in results:
+        seconds = timeit.timeit(lookup, number=repeat) / repeat
+        print("%-20s %.3f us" % (label, seconds * 1e6))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        benchmark(int(sys.argv[1]))
+    else:
+        benchmark()
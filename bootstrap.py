@@ -0,0 +1,44 @@
+
+# The single place where the engine is created. World modules don't touch the display or the
+# mixer when imported, so the engine has to exist before any world is constructed.
+
+from os import environ
+
+from engine import Engine
+from startup import timer
+from headless import use_dummy_drivers
+from timestep import use_synthetic_clock
+
+
+class EngineConfig(object):
+
+    def __init__(self, width=1200, height=700, startup_report=None, headless=None, headless_ticks=None,
+                 frame_time=1 / 60.0):
+        self.width = width
+        self.height = height
+
+        # log the startup timings once every world is loaded
+        if startup_report is None:
+            startup_report = bool(environ.get("LUMINESCENCE_STARTUP_REPORT", ""))
+        self.startup_report = startup_report
+
+        # run every world for headless_ticks ticks without a window and report their speed (see headless)
+        if headless is None:
+            headless = bool(environ.get("LUMINESCENCE_HEADLESS", ""))
+        self.headless = headless
+
+        if headless_ticks is None:
+            headless_ticks = int(environ.get("LUMINESCENCE_HEADLESS_TICKS", "600"))
+        self.headless_ticks = headless_ticks
+
+        # seconds a headless frame is taken to last
+        self.frame_time = frame_time
+
+
+def create_engine(config):
+    if config.headless:
+        use_dummy_drivers()
+        use_synthetic_clock(config.frame_time)
+
+    with timer.phase("display init"):
+        return Engine(config.width, config.height)
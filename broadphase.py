@@ -0,0 +1,165 @@
+
+# A uniform grid over the colliders of a world, so scripts that look for colliders around a box
+# only test the ones in the cells it covers instead of every entity of the world.
+#
+# Colliders that never move are binned once, when the world calls build_static at the end of
+# load_scene, and stay in that grid until remove takes them out. The entities that move (rigid
+# bodies, colliders treated as dynamic and the ones the world names, such as entities moved by
+# scripts) are binned into a second grid the first time it is queried in a frame, and
+# UpdateBroadphase marks that grid out of date once per frame. Candidates are tested against their
+# live boxes, so a collider moved by a script later in the same frame is still tested where it is now.
+# Queries around a collider drop the pairs whose categories and masks don't match before testing
+# the boxes.
+
+from math import floor
+
+from components import WorldScript
+from asset_cache import frame_io_guard
+from collision_routing import collision_category, collides, ALL
+
+DEFAULT_CELL_SIZE = 128
+
+
+class Broadphase(object):
+
+    def __init__(self, world, cell_size=DEFAULT_CELL_SIZE):
+        self.world = world
+        self.cell_size = cell_size
+
+        # colliders that never move, and the colliders of the moving entities, by (column, row) cell
+        self.static_cells = dict()
+        self.cells = dict()
+
+        # entities re-binned every frame, their collider can come and go
+        self.movers = list()
+
+        # the moving grid is rebuilt when frame and built_frame differ
+        self.frame = 0
+        self.built_frame = -1
+
+        self.rebuilds = 0
+        self.candidates = 0
+        self.masked = 0
+
+    def next_frame(self):
+        self.frame += 1
+
+    def cell_range(self, rect):
+        size = float(self.cell_size)
+        min_col = int(floor(rect.left / size))
+        min_row = int(floor(rect.top / size))
+
+        # right and bottom are exclusive in a Rect
+        max_col = int(floor((rect.right - 1) / size))
+        max_row = int(floor((rect.bottom - 1) / size))
+
+        return min_col, min_row, max_col, max_row
+
+    def insert(self, cells, collider):
+        min_col, min_row, max_col, max_row = self.cell_range(collider.box)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                cells.setdefault((col, row), list()).append(collider)
+
+    @staticmethod
+    def is_moving(entity):
+        return entity.rigid_body is not None or entity.collider.treat_as_dynamic
+
+    # Bins the colliders of the world that don't move. movers are the entities that move without
+    # being a rigid body or treated as dynamic, or that only get a collider later on.
+    def build_static(self, movers=()):
+        self.static_cells.clear()
+        self.movers = list(movers)
+
+        mover_ids = set(id(entity) for entity in self.movers)
+        for entity in self.world.entity_manager.entities:
+            if id(entity) in mover_ids or entity.collider is None:
+                continue
+
+            if self.is_moving(entity):
+                self.movers.append(entity)
+            else:
+                self.insert(self.static_cells, entity.collider)
+
+        self.built_frame = -1
+
+    # takes the entity out of the broadphase, for entities that are destroyed
+    def remove(self, entity):
+        if entity in self.movers:
+            self.movers.remove(entity)
+            self.built_frame = -1
+
+        collider = entity.collider
+        if collider is None:
+            return
+
+        for key, colliders in list(self.static_cells.items()):
+            if collider in colliders:
+                colliders.remove(collider)
+                if not colliders:
+                    del self.static_cells[key]
+
+    def rebuild(self):
+        self.cells.clear()
+
+        for entity in self.movers:
+            if entity.collider is not None:
+                self.insert(self.cells, entity.collider)
+
+        self.built_frame = self.frame
+        self.rebuilds += 1
+
+    # Colliders whose box overlaps the rect and whose category matches the mask. When a collider is
+    # given, it is left out and so are the colliders it doesn't make a pair with.
+    def query_rect(self, rect, mask=ALL, collider=None):
+        if self.built_frame != self.frame:
+            self.rebuild()
+
+        found = list()
+        seen = set()
+
+        min_col, min_row, max_col, max_row = self.cell_range(rect)
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for cells in (self.static_cells, self.cells):
+                    for other in cells.get((col, row), ()):
+                        if id(other) in seen:
+                            continue
+
+                        seen.add(id(other))
+                        if collider is not None:
+                            if other is collider:
+                                continue
+                            if not collides(collider, other):
+                                self.masked += 1
+                                continue
+
+                        self.candidates += 1
+                        if collision_category(other) & mask and rect.colliderect(other.box):
+                            found.append(other)
+
+        return found
+
+    # Colliders within tolerance pixels of the collider, not counting the collider itself.
+    def query_near(self, collider, tolerance, mask=ALL):
+        rect = collider.box.inflate(2 * tolerance, 2 * tolerance)
+        return self.query_rect(rect, mask, collider)
+
+    def stats(self):
+        return {"static cells": len(self.static_cells),
+                "moving cells": len(self.cells),
+                "movers": len(self.movers),
+                "rebuilds": self.rebuilds,
+                "candidates": self.candidates,
+                "masked pairs": self.masked}
+
+
+# Marks the world's broadphase out of date every frame, every world with a broadphase needs it.
+@frame_io_guard
+class UpdateBroadphase(WorldScript):
+
+    def __init__(self):
+        super(UpdateBroadphase, self).__init__("update broadphase")
+
+    def update(self):
+        self.world.broadphase.next_frame()
@@ -0,0 +1,33 @@
+
+# Merging the cells of a grid that never change, such as the walls of the maze, into a few large
+# rectangles, so that collisions are tested against the rectangles instead of every cell.
+
+
+# Merges a collection of (column, row) cells into maximal rectangles. Cells are consumed in
+# row-major order, each rectangle grows to the right as far as possible and then down while
+# the whole span of the next row is filled. Returns a list of (column, row, columns, rows).
+def merge_cells(cells):
+    remaining = set(cells)
+    rects = list()
+
+    for cell in sorted(remaining, key=lambda c: (c[1], c[0])):
+        if cell not in remaining:
+            continue
+
+        col, row = cell
+
+        w = 1
+        while (col + w, row) in remaining:
+            w += 1
+
+        h = 1
+        while all((c, row + h) in remaining for c in range(col, col + w)):
+            h += 1
+
+        for r in range(row, row + h):
+            for c in range(col, col + w):
+                remaining.discard((c, r))
+
+        rects.append((col, row, w, h))
+
+    return rects
@@ -0,0 +1,104 @@
+
+# Collision categories and routing of collision callbacks.
+#
+# Colliders can be given a category bit, and a mask of the categories they care about. Scripts
+# that derive from CollisionRouter register a handler per entity name, tag or category; their
+# collision_event then looks the other entity up in a dictionary instead of every script running a
+# chain of string compares, and contacts with categories outside of the script's mask are dropped
+# right away. The physics step of the engine can't be told about the categories and still tests
+# every pair, but the pairs the scripts test themselves go through the world's broadphase, which
+# drops the pairs whose categories and masks don't match (see collides).
+
+from components import BehaviorScript
+from asset_cache import frame_io_guard
+
+# collision categories
+PLAYER = 1 << 0
+GROUND = 1 << 1
+CRATE = 1 << 2
+TRIGGER = 1 << 3
+LADDER = 1 << 4
+HAZARD = 1 << 5
+LIGHT = 1 << 6
+MONSTER = 1 << 7
+
+# colliders that were never given a category
+UNCATEGORIZED = 1 << 15
+
+ALL = 0xFFFF
+
+# the categories each category cares about, for the colliders that aren't given a mask
+MASKS = {
+    GROUND: ALL & ~GROUND,
+    CRATE: PLAYER | GROUND | CRATE | TRIGGER,
+    TRIGGER: PLAYER | CRATE,
+    LADDER: PLAYER,
+    HAZARD: PLAYER,
+    LIGHT: PLAYER | MONSTER,
+}
+
+
+def set_collision_category(collider, category, mask=None):
+    if mask is None:
+        mask = MASKS.get(category, ALL)
+
+    collider.category = category
+    collider.collision_mask = mask
+
+
+def collision_category(collider):
+    return getattr(collider, "category", UNCATEGORIZED)
+
+
+def collision_mask(collider):
+    return getattr(collider, "collision_mask", ALL)
+
+
+# whether the pair of colliders is tested, both have to care about the category of the other one
+def collides(collider, other):
+    return bool(collision_category(collider) & collision_mask(other) and
+                collision_category(other) & collision_mask(collider))
+
+
+# Base class for scripts that react to collisions with specific entities. Handlers are called
+# with the other collider; a contact can match a name, a tag and categories, and each matching
+# handler is called once.
+@frame_io_guard
+class CollisionRouter(BehaviorScript):
+
+    def __init__(self, script_name, mask=ALL):
+        super(CollisionRouter, self).__init__(script_name)
+        self.mask = mask
+
+        self.name_handlers = dict()
+        self.tag_handlers = dict()
+        self.category_handlers = list()
+
+    def on_name(self, name, handler):
+        self.name_handlers[name] = handler
+
+    def on_tag(self, tag, handler):
+        self.tag_handlers[tag] = handler
+
+    def on_category(self, category, handler):
+        self.category_handlers.append((category, handler))
+
+    def collision_event(self, other_collider):
+        self.route(other_collider.entity, other_collider, collision_category(other_collider))
+
+    # calls the handlers matching the entity with the argument
+    def route(self, entity, argument, category=UNCATEGORIZED):
+        if not category & self.mask:
+            return
+
+        handler = self.name_handlers.get(entity.name)
+        if handler is not None:
+            handler(argument)
+
+        handler = self.tag_handlers.get(entity.tag)
+        if handler is not None:
+            handler(argument)
+
+        for handler_category, handler in self.category_handlers:
+            if category & handler_category:
+                handler(argument)
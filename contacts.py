@@ -0,0 +1,71 @@
+
+# Contacts of colliders, worked out once per frame. Scripts that ask the same question several
+# times a frame (is the player on the ground, is it on a ladder) read the contacts of the
+# collider instead of testing it against every ground or ladder entity each time they ask.
+#
+# A contact is a (collider, side) pair, where the other collider is within the tolerance hit
+# box of this one and side is where this collider was hit, as given by calc_box_hit_orientation.
+# The contacts of a collider are found with the world's broadphase the first time they are asked
+# for in a frame, and are kept until the broadphase moves on to the next frame. Colliders that
+# don't make a pair with the collider (see collision_routing.collides) are never its contacts.
+
+from systems import PhysicsSystem
+from collision_routing import collision_category, ALL
+
+# room around the tolerance hit box for the tolerance hit box of the other collider
+CONTACT_MARGIN = 32
+
+
+class ContactCache(object):
+
+    def __init__(self, broadphase, margin=CONTACT_MARGIN):
+        self.broadphase = broadphase
+        self.margin = margin
+
+        # contacts by collider id, and the frame they were found in
+        self.contacts_by_id = dict()
+        self.frame = -1
+
+        self.hits = 0
+        self.misses = 0
+
+    # the (collider, side) contacts of the collider with colliders whose category matches the mask
+    def contacts(self, collider, mask=ALL):
+        if self.frame != self.broadphase.frame:
+            self.contacts_by_id.clear()
+            self.frame = self.broadphase.frame
+
+        found = self.contacts_by_id.get(id(collider))
+        if found is None:
+            self.misses += 1
+            found = self.find(collider)
+            self.contacts_by_id[id(collider)] = found
+        else:
+            self.hits += 1
+
+        if mask == ALL:
+            return found
+
+        return [contact for contact in found if collision_category(contact[0]) & mask]
+
+    def find(self, collider):
+        area = collider.tolerance_hitbox.inflate(2 * self.margin, 2 * self.margin)
+
+        found = list()
+        for other in self.broadphase.query_rect(area, collider=collider):
+            if PhysicsSystem.tolerance_collision(collider, other):
+                found.append((other, PhysicsSystem.calc_box_hit_orientation(collider, other)))
+
+        return found
+
+    # whether the collider touches a collider of the mask, on the given side if one is given
+    def touching(self, collider, mask=ALL, side=None):
+        for other, other_side in self.contacts(collider, mask):
+            if side is None or other_side == side:
+                return True
+        return False
+
+    def stats(self):
+        return {"colliders": len(self.contacts_by_id),
+                "hits": self.hits,
+                "misses": self.misses}
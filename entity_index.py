@@ -0,0 +1,107 @@
+
+# Constant time lookups of entities by tag and of scripts by name, for code that runs every frame.
+#
+# TagIndex keeps the entities of a world in lists by tag. The world builds it at the end of
+# load_scene, once the tags are given (a lookup before that builds it too), and from then on tells
+# it about every change, the same way it tells its broadphase: add() for an entity created while
+# the world runs, remove() for one that is destroyed and retag() to change a tag. Lookups check
+# that the world has as many entities as the index and that the entities found still have the tag,
+# and raise TagIndexError otherwise. An entity whose tag was set behind the index's back is only
+# caught that way when it is looked up under its old tag; set the LUMINESCENCE_TAG_CHECK
+# environment variable to compare the whole index against the world on every lookup.
+#
+# ScriptHandle looks a script up the first time it is used and keeps it, which suits the scripts
+# that stay for the life of the entity.
+
+from os import environ
+
+# debug mode that checks every entity on every lookup, read when the module is imported
+TAG_CHECK = bool(environ.get("LUMINESCENCE_TAG_CHECK", ""))
+
+
+class TagIndexError(RuntimeError):
+    pass
+
+
+class TagIndex(object):
+
+    def __init__(self, world):
+        self.world = world
+
+        # entities by tag, and the number of entities indexed, None until the index is built
+        self.by_tag = dict()
+        self.count = None
+
+        self.builds = 0
+
+    # indexes every entity of the world
+    def build(self):
+        self.by_tag.clear()
+
+        entities = self.world.entity_manager.entities
+        for entity in entities:
+            self.by_tag.setdefault(entity.tag, list()).append(entity)
+
+        self.count = len(entities)
+        self.builds += 1
+
+    def add(self, entity):
+        self.by_tag.setdefault(entity.tag, list()).append(entity)
+        self.count += 1
+
+    def remove(self, entity):
+        self.by_tag[entity.tag].remove(entity)
+        self.count -= 1
+
+    def retag(self, entity, tag):
+        self.by_tag[entity.tag].remove(entity)
+        self.by_tag.setdefault(tag, list()).append(entity)
+
+        entity.tag = tag
+
+    def check(self):
+        entities = self.world.entity_manager.entities
+        if len(entities) != self.count:
+            raise TagIndexError("%d entities indexed, the world has %d: use add() and remove()"
+                                % (self.count, len(entities)))
+
+        if TAG_CHECK:
+            for tag, tagged in self.by_tag.items():
+                for entity in tagged:
+                    self.check_tag(entity, tag)
+
+    @staticmethod
+    def check_tag(entity, tag):
+        if entity.tag != tag:
+            raise TagIndexError("entity indexed as %r is tagged %r: use retag()" % (tag, entity.tag))
+
+    # the entities with the tag, in the order they were indexed
+    def entities(self, tag):
+        if self.count is None:
+            self.build()
+        self.check()
+
+        found = self.by_tag.get(tag, ())
+        for entity in found:
+            self.check_tag(entity, tag)
+
+        return found
+
+    # the first entity with the tag, like World.get_entity_by_tag
+    def first(self, tag):
+        found = self.entities(tag)
+        return found[0] if found else None
+
+
+class ScriptHandle(object):
+
+    def __init__(self, name, entity=None):
+        self.name = name
+        self.entity = entity
+        self.script = None
+
+    # the entity can be given here for handles made before the script's entity is known
+    def get(self, entity=None):
+        if self.script is None:
+            self.script = (entity or self.entity).get_script(self.name)
+        return self.script
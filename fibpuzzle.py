@@ -3,13 +3,17 @@ from world import *
 from engine import *
 from components import BehaviorScript
 from components import WorldScript
-
-engine = Engine(1200, 700)
-
-# sound effect to play once the puzzle is completed
-puzzle_finished_sfx = mixer.Sound("assets/sound/piano_low_key.wav")
+from asset_cache import load_image, loads_manifest, frame_io_guard, CONVERT
+from snapshot import captures_initial_state
+from sounds import play_sound
+from music import music, UpdateMusic
+from broadphase import Broadphase, UpdateBroadphase
+from timestep import FixedTimestep
+from fixed_step import AdvanceClock
+from collision_routing import set_collision_category, CRATE, GROUND
 
 
+@frame_io_guard
 class CheckBoxes(WorldScript):
 
         def __init__(self):
@@ -65,26 +69,27 @@ class CheckBoxes(WorldScript):
 
             # puzzle has been finished - play a sound to notify the player
             self.world.puzzle_finished = True
-            puzzle_finished_sfx.play()
+            play_sound("assets/sound/piano_low_key.wav")
 
             return True
 
 
+@frame_io_guard
 class PlayerFibMovement(BehaviorScript):
 
     def __init__(self):
         super(PlayerFibMovement, self).__init__("player move")
         self.h_speed = 200
         self.v_speed = 300
-        self.right = pygame.image.load("assets/images/character/character_east.png").convert_alpha()
-        self.left = pygame.image.load("assets/images/character/character_west.png").convert_alpha()
-        self.up = pygame.image.load("assets/images/character/character_north.png").convert_alpha()
-        self.down  = pygame.image.load("assets/images/character/character_south.png").convert_alpha()
+        self.right = load_image("assets/images/character/character_east.png")
+        self.left = load_image("assets/images/character/character_west.png")
+        self.up = load_image("assets/images/character/character_north.png")
+        self.down  = load_image("assets/images/character/character_south.png")
 
-        self.up_right = pygame.image.load("assets/images/character/character_northeast.png").convert_alpha()
-        self.up_left = pygame.image.load("assets/images/character/character_northwest.png").convert_alpha()
-        self.down_right = pygame.image.load("assets/images/character/character_southeast.png").convert_alpha()
-        self.down_left = pygame.image.load("assets/images/character/character_southwest.png").convert_alpha()
+        self.up_right = load_image("assets/images/character/character_northeast.png")
+        self.up_left = load_image("assets/images/character/character_northwest.png")
+        self.down_right = load_image("assets/images/character/character_southeast.png")
+        self.down_left = load_image("assets/images/character/character_southwest.png")
 
         self.selected_crate = None
 
@@ -154,40 +159,43 @@ class PlayerFibMovement(BehaviorScript):
                 elif event.key == pygame.K_SPACE and self.selected_crate is not None:
                     self.selected_crate = None
 
+    # moves the crate on the world's clock, so a long frame can't push it through a wall
     def move_crate(self):
+        clock = self.entity.world.clock
+        for i in range(clock.steps):
+            self.move_crate_step(clock.tick)
+
+    def move_crate_step(self, dt):
         v = self.entity.rigid_body.velocity
-        dt = self.entity.world.engine.delta_time
 
         crate = self.selected_crate
 
         # stop movement
-        # colliders of the world
-        entity_colliders = self.entity.world.boxes + self.entity.world.walls
+        # the other boxes and the walls around the crate
+        others = self.entity.world.broadphase.query_near(crate.collider, 1, CRATE | GROUND)
 
         move_x = 1
         move_y = 1
 
-        for other in entity_colliders:
+        for other in others:
 
-            if crate is not other:
+            # if the selected crate collided with anything else
+            if PhysicsSystem.box2box_collision(crate.collider, other):
 
-                # if the selected crate collided with anything else
-                if PhysicsSystem.box2box_collision(crate.collider, other.collider):
+                # figure out from what direction it hit the other object
+                side = PhysicsSystem.calc_box_hit_orientation(crate.collider, other)
 
-                    # figure out from what direction it hit the other object
-                    side = PhysicsSystem.calc_box_hit_orientation(crate.collider, other.collider)
+                # get crate outside the collider
+                PhysicsSystem._resolve_box2box_with_collider(side, crate.transform, crate.collider, other)
 
-                    # get crate outside the collider
-                    PhysicsSystem._resolve_box2box_with_collider(side, crate.transform, crate.collider, other.collider)
+                # stop the crate in place
+                # hit from top or bottom
+                if side == PhysicsSystem.bottom or side == PhysicsSystem.top:
+                    move_y = 0
 
-                    # stop the crate in place
-                    # hit from top or bottom
-                    if side == PhysicsSystem.bottom or side == PhysicsSystem.top:
-                        move_y = 0
-
-                    # hit from left or right
-                    elif side == PhysicsSystem.right or side == PhysicsSystem.left:
-                        move_x = 0
+                # hit from left or right
+                elif side == PhysicsSystem.right or side == PhysicsSystem.left:
+                    move_x = 0
 
         # move crate if possible
         self.selected_crate.transform.position.x += v.x * dt * move_x
@@ -241,6 +249,31 @@ class PlayerFibMovement(BehaviorScript):
 
 class FibWorld(World):
 
+    # background music, played by the music manager
+    music_track = "assets/music/game_select_bak.ogg"
+
+    # images needed by the puzzle and the player script
+    asset_manifest = [
+        ("assets/images/floors/Floor.png", CONVERT),
+        "assets/images/floors/Lamps.png",
+        "assets/images/character/character_north.png",
+        "assets/images/character/character_south.png",
+        "assets/images/character/character_east.png",
+        "assets/images/character/character_west.png",
+        "assets/images/character/character_northeast.png",
+        "assets/images/character/character_northwest.png",
+        "assets/images/character/character_southeast.png",
+        "assets/images/character/character_southwest.png",
+        "assets/images/crates/FibonacciBox_37a.png",
+        "assets/images/crates/FibonacciBox_37b.png",
+        "assets/images/crates/FibonacciBox_74.png",
+        "assets/images/crates/FibonacciBox_111.png",
+        "assets/images/crates/FibonacciBox_185.png",
+        "assets/images/crates/FibonacciBox_296.png"
+    ]
+
+    sound_manifest = ["assets/sound/piano_low_key.wav"]
+
     def __init__(self):
         super(FibWorld, self).__init__()
 
@@ -261,11 +294,18 @@ class FibWorld(World):
 
         self.trigger_object_exit = None
 
+        # colliders indexed on a grid for the crate checks
+        self.broadphase = None
+
+        # fixed ticks for moving the crates
+        self.clock = None
+
     def resume(self):
-        mixer.music.load("assets/music/game_select_bak.ogg")
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.3)
+        # continue the world's music from where it was left
+        music.play(self.music_track)
 
+    @captures_initial_state
+    @loads_manifest
     def load_scene(self):
 
         self.trigger_object_exit = self.create_box_collider_object(200, 60)
@@ -273,8 +313,8 @@ class FibWorld(World):
         self.trigger_object_exit.transform.position = Vector2(-90, 100)
         self.trigger_object_exit.name = "trigger object exit"
 
-        background_image = pygame.image.load("assets/images/floors/Floor.png").convert()
-        lamps_image  = pygame.image.load("assets/images/floors/Lamps.png").convert_alpha()
+        background_image = load_image("assets/images/floors/Floor.png", CONVERT)
+        lamps_image  = load_image("assets/images/floors/Lamps.png")
 
         # add necessary components to be able to position and render 
         # the background
@@ -289,7 +329,7 @@ class FibWorld(World):
         background_lamps.renderer.depth = -100
 
         # frames to demonstrate player animation
-        frame1 = pygame.image.load("assets/images/character/character_west.png").convert_alpha()
+        frame1 = load_image("assets/images/character/character_west.png")
 
         # setupt the player
         self.player = self.create_game_object(frame1)
@@ -306,40 +346,46 @@ class FibWorld(World):
 
         # boxes to be moved around
         # 450, 275 # 500, 275 # 475, 200 # 350, 225 # 400, 425 # 725, 350
-        box_image = pygame.image.load("assets/images/crates/FibonacciBox_37a.png").convert_alpha()
+        box_image = load_image("assets/images/crates/FibonacciBox_37a.png")
         pbox = self.create_game_object(box_image)
         pbox.transform.position = Vector2(526+600, 294-50)
         pbox.tag = "pbox1"
+        set_collision_category(pbox.collider, CRATE)
         self.boxes.append(pbox)
 
-        box_image = pygame.image.load("assets/images/crates/FibonacciBox_37b.png").convert_alpha()
+        box_image = load_image("assets/images/crates/FibonacciBox_37b.png")
         pbox = self.create_game_object(box_image)
         pbox.transform.position = Vector2(489-400, 294+50)
         pbox.tag = "pbox2"
+        set_collision_category(pbox.collider, CRATE)
         self.boxes.append(pbox)
 
-        box_image = pygame.image.load("assets/images/crates/FibonacciBox_74.png").convert_alpha()
+        box_image = load_image("assets/images/crates/FibonacciBox_74.png")
         pbox = self.create_game_object(box_image)
         pbox.transform.position = Vector2(508+450, 239-150)
         pbox.tag = "pbox3"
+        set_collision_category(pbox.collider, CRATE)
         self.boxes.append(pbox)
 
-        box_image = pygame.image.load("assets/images/crates/FibonacciBox_111.png").convert_alpha()
+        box_image = load_image("assets/images/crates/FibonacciBox_111.png")
         pbox = self.create_game_object(box_image)
         pbox.transform.position = Vector2(415+200, 257+200)
         pbox.tag = "pbox4"
+        set_collision_category(pbox.collider, CRATE)
         self.boxes.append(pbox)
 
-        box_image = pygame.image.load("assets/images/crates/FibonacciBox_185.png").convert_alpha()
+        box_image = load_image("assets/images/crates/FibonacciBox_185.png")
         pbox = self.create_game_object(box_image)
         pbox.transform.position = Vector2(452-100, 405+150)
         pbox.tag = "pbox5"
+        set_collision_category(pbox.collider, CRATE)
         self.boxes.append(pbox)
 
-        box_image = pygame.image.load("assets/images/crates/FibonacciBox_296.png").convert_alpha()
+        box_image = load_image("assets/images/crates/FibonacciBox_296.png")
         pbox = self.create_game_object(box_image)
         pbox.transform.position = Vector2(692+230, 350+150)
         pbox.tag = "pbox6"
+        set_collision_category(pbox.collider, CRATE)
         self.boxes.append(pbox)
 
         #screen dimensions halved 
@@ -363,10 +409,20 @@ class FibWorld(World):
         self.add_script(CheckBoxes())
 
         self.walls = [self.topWall, self.leftWall, self.rightWall, self.bottomWall]
+        for wall in self.walls:
+            set_collision_category(wall.collider, GROUND)
+
+        # the boxes are moved by the player's script
+        self.broadphase = Broadphase(self)
+        self.broadphase.build_static(self.boxes)
+        self.add_script(UpdateBroadphase())
+
+        self.clock = FixedTimestep()
+        self.add_script(AdvanceClock())
 
-        # start the background music and set it to loop forever
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.3)
+        # start the background music, it loops forever
+        self.add_script(UpdateMusic())
+        music.play(self.music_track)
 
 # f = FibWorld()
 # engine.set_world(f)
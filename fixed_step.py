@@ -0,0 +1,88 @@
+
+
+# Fixed timestep updates for the entities that scripts move themselves.
+#
+# The world's clock (see timestep) says how many fixed ticks to run each frame. Movers simulate
+# their position tick by tick and draw it interpolated between the last two ticks, so the movement
+# stays smooth when the frame rate and the tick rate differ.
+
+from components import BehaviorScript, WorldScript
+from util_math import Vector2
+from asset_cache import frame_io_guard
+from timestep import frame_time
+
+
+# Advances the world's clock every frame, every world with a clock needs it.
+@frame_io_guard
+class AdvanceClock(WorldScript):
+
+    def __init__(self):
+        super(AdvanceClock, self).__init__("advance clock")
+
+    def update(self):
+        self.world.clock.advance(frame_time(self.world))
+
+
+# Base class of scripts that move their entity on the world's clock. Subclasses implement
+# fixed_update(dt), which moves self.position by one tick. The entity's transform holds the
+# simulated position, so the physics system and the collisions work on the simulation; only the
+# sprite is drawn between the positions of the last two ticks, by offsetting the renderer's pivot.
+# Moving the entity's transform from anywhere else (a collision resetting it, for example) places
+# the entity there without interpolating.
+@frame_io_guard
+class FixedStepMover(BehaviorScript):
+
+    def __init__(self, script_name):
+        super(FixedStepMover, self).__init__(script_name)
+
+        # simulated position after the last tick and the tick before it
+        self.position = None
+        self.previous = None
+
+        # the interpolated position the entity was last drawn at
+        self.shown = None
+
+        # the renderer's pivot without the interpolation offset, and the pivot that was last set
+        self.pivot = None
+        self.shown_pivot = None
+
+    def update(self):
+        clock = self.entity.world.clock
+        transform = self.entity.transform
+
+        current = (transform.position.x, transform.position.y)
+        if self.position is None or current != (self.position.x, self.position.y):
+            self.position = Vector2(current[0], current[1])
+            self.previous = Vector2(current[0], current[1])
+
+        for i in range(clock.steps):
+            self.previous = Vector2(self.position.x, self.position.y)
+            self.fixed_update(clock.tick)
+
+        alpha = clock.alpha
+        x = self.previous.x + (self.position.x - self.previous.x) * alpha
+        y = self.previous.y + (self.position.y - self.previous.y) * alpha
+
+        transform.position = Vector2(self.position.x, self.position.y)
+        self.shown = (x, y)
+        self.draw_at(x, y)
+
+    # offsets the sprite from the transform so that it is drawn at the position
+    def draw_at(self, x, y):
+        renderer = self.entity.renderer
+        if renderer is None:
+            return
+
+        # the pivot was set from somewhere else, such as for a new image
+        pivot = (renderer.pivot.x, renderer.pivot.y)
+        if pivot != self.shown_pivot:
+            self.pivot = pivot
+
+        pivot_x = self.pivot[0] + self.position.x - x
+        pivot_y = self.pivot[1] + self.position.y - y
+
+        renderer.pivot = Vector2(pivot_x, pivot_y)
+        self.shown_pivot = (pivot_x, pivot_y)
+
+    def fixed_update(self, dt):
+        pass
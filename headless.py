@@ -0,0 +1,94 @@
+
+# Running the worlds without a window, to measure how many ticks per second each of them
+# simulates. The display and the mixer use the SDL dummy drivers, there are no title or end
+# screens, the worlds don't have a render system once they are loaded, and the clock of the
+# script driven movement advances by a fixed synthetic frame time instead of the time that really
+# passed. Enable it by setting the LUMINESCENCE_HEADLESS environment variable.
+
+import os
+import sys
+import time
+
+from components import WorldScript
+from systems import RenderSystem
+from asset_cache import frame_io_guard
+
+
+# must be called before the display and the mixer are initialized
+def use_dummy_drivers():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+# Counts the updates of the world it is added to, and reports the time the ticks took once
+# it has seen the given number of them. Nothing is drawn while it counts.
+@frame_io_guard
+class ThroughputProbe(WorldScript):
+
+    def __init__(self, ticks, on_done):
+        super(ThroughputProbe, self).__init__("throughput probe")
+        self.ticks = ticks
+        self.on_done = on_done
+
+        self.count = 0
+        self.start = None
+
+    def update(self):
+        self.count += 1
+
+        # the first update starts the measurement, the world has finished loading by then
+        if self.start is None:
+            self.world.remove_system(RenderSystem.tag)
+            self.start = time.time()
+
+        elif self.count == self.ticks + 1:
+            self.on_done(self.world, self.ticks, time.time() - self.start)
+
+
+# Runs each of the worlds in turn for a number of ticks, then prints the ticks per second of
+# every world and quits.
+class ThroughputRun(object):
+
+    def __init__(self, engine, worlds, ticks, on_quit=None):
+        self.engine = engine
+        self.worlds = list(worlds)
+        self.ticks = ticks
+        self.on_quit = on_quit
+
+        self.index = 0
+
+        # (world name, ticks, seconds) of the worlds that were measured
+        self.results = list()
+
+    def start(self):
+        self.index = 0
+        self.next_world()
+
+    def next_world(self):
+        if self.index >= len(self.worlds):
+            self.finish()
+            return
+
+        world = self.worlds[self.index]
+        self.index += 1
+
+        self.engine.set_world(world)
+        world.add_script(ThroughputProbe(self.ticks, self.world_done))
+
+    def world_done(self, world, ticks, seconds):
+        world.remove_script("throughput probe")
+        self.results.append((type(world).__name__, ticks, seconds))
+        self.next_world()
+
+    def report(self):
+        lines = ["ticks per second:"]
+        for name, ticks, seconds in self.results:
+            lines.append("  %-16s %8.1f  (%d ticks in %.3fs)" % (name, ticks / max(seconds, 1e-9), ticks, seconds))
+        return "\n".join(lines)
+
+    def finish(self):
+        print(self.report())
+
+        if self.on_quit is not None:
+            self.on_quit()
+        sys.exit(0)
@@ -0,0 +1,84 @@
+
+# Loader for the grid based level files in assets/levels. A level is a json file whose "rows"
+# hold one character per cell:
+#   #     wall
+#   .     empty
+#   1-9   lever with that number
+#   a-i   wall that blocks the path until the lever with the matching number (a = 1) is touched
+# The rest of the file lists cells for decorations (floors, beams) and per lever settings.
+
+import json
+from os.path import getmtime, normpath
+
+WALL = "#"
+EMPTY = "."
+
+
+class GridLevel(object):
+
+    def __init__(self, data):
+        self.cell_size = tuple(data["cell_size"])
+
+        # cell of the first character of the first row
+        origin = data["origin"]
+        rows = data["rows"]
+
+        self.min_cell = (origin[0], origin[1])
+        self.max_cell = (origin[0] + max(len(row) for row in rows) - 1, origin[1] + len(rows) - 1)
+
+        self.walls = list()
+        self.levers = dict()
+        self.blocked_walls = dict()
+
+        # one pass over the grid to sort the cells by type
+        for row_index, row in enumerate(rows):
+            for col_index, char in enumerate(row):
+
+                if char == EMPTY:
+                    continue
+
+                cell = (origin[0] + col_index, origin[1] + row_index)
+
+                if char == WALL:
+                    self.walls.append(cell)
+
+                elif "1" <= char <= "9":
+                    self.levers[int(char)] = cell
+
+                elif "a" <= char <= "i":
+                    self.blocked_walls[ord(char) - ord("a") + 1] = cell
+
+                else:
+                    raise ValueError("unknown level cell " + repr(char) + " at " + str(cell))
+
+        self.floors = [tuple(c) for c in data.get("floors", [])]
+        self.vertical_beams = [tuple(c) for c in data.get("vertical_beams", [])]
+        self.horizontal_beams = [tuple(c) for c in data.get("horizontal_beams", [])]
+
+        self.lever_frame_latency = data.get("lever_frame_latency", dict())
+        self.lever_on_image = data.get("lever_on_image", dict())
+
+    # per lever settings fall back to the "default" entry
+    def lever_setting(self, settings, lever_id):
+        return settings.get(str(lever_id), settings.get("default"))
+
+
+# parsed levels by path, along with the modification time of the file when it was parsed
+_levels = dict()
+
+
+# Returns the parsed level at the path. Levels are parsed once per process and only parsed
+# again if the file changes.
+def load_level(path):
+    path = normpath(path)
+    mtime = getmtime(path)
+
+    cached = _levels.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path) as level_file:
+        level = GridLevel(json.load(level_file))
+
+    _levels[path] = (mtime, level)
+    return level
@@ -0,0 +1,49 @@
+
+# Precomputed sizes of a light mask. A light that dims over time picks one of a fixed set of
+# levels instead of rescaling its mask while it dims, so the scaling is done once when the world
+# loads and dimming only swaps the image the renderer shows.
+
+from math import ceil
+
+from pygame import transform
+
+from util_math import Vector2
+from asset_cache import surface_bytes
+
+DEFAULT_LEVELS = 20
+
+
+class LightMaskPyramid(object):
+
+    # Level i is the mask scaled by i / levels, level 0 being the smallest mask that can be drawn
+    # and the last level the mask itself.
+    def __init__(self, mask, levels=DEFAULT_LEVELS):
+        self.mask = mask
+        self.levels = levels
+
+        w, h = mask.get_size()
+
+        self.surfaces = list()
+        for i in range(levels):
+            scale = i / float(levels)
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            self.surfaces.append(transform.smoothscale(mask, size))
+
+        self.surfaces.append(mask)
+
+    # the level for value out of maximum, rounded up to the next level
+    def level_for(self, value, maximum):
+        level = int(ceil(value * self.levels / float(maximum)))
+        return min(max(level, 0), self.levels)
+
+    # shows the level on the entity's renderer, centered like the mask
+    def apply(self, entity, level):
+        surface = self.surfaces[level]
+        entity.renderer.set_image(surface)
+        entity.renderer.pivot = Vector2(surface.get_width() / 2.0, surface.get_height() / 2.0)
+
+    def memory_report(self):
+        level_bytes = [surface_bytes(surface) for surface in self.surfaces]
+
+        # the last level is the mask, which is loaded anyway
+        return {"level_bytes": level_bytes, "total_bytes": sum(level_bytes[:-1])}
@@ -0,0 +1,214 @@
+
+# A lightmap for dark worlds, composited with NumPy at a fraction of the screen resolution.
+#
+# Every frame the light sources of the render system that are inside the camera view add their
+# mask's alpha into a small buffer, lights outside of the view are skipped, and the lights that
+# never move are only added again when the camera or the set of visible static lights changes.
+# The buffer is turned into a darkness overlay and scaled up to the view once, and an entity
+# drawn in front of everything shows it.
+#
+# NumPy is optional. Without it available() is False and the world keeps the render system's
+# own dark environment.
+
+import time
+
+try:
+    import numpy
+    from pygame import surfarray
+except ImportError:
+    numpy = None
+
+import pygame
+from pygame import Surface, transform
+
+from components import BehaviorScript, Transform, Renderer
+from systems import RenderSystem
+from util_math import Vector2
+from asset_cache import frame_io_guard
+
+# depth of the overlay, in front of everything else in the world
+OVERLAY_DEPTH = -100000
+
+
+def available():
+    return numpy is not None
+
+
+class LightmapSettings(object):
+
+    # downscale: the buffer is this many times smaller than the view on each axis
+    # darkness: alpha of the overlay where there is no light
+    # smooth: scale the overlay up with smoothscale instead of scale
+    # static_tags: tags of the light sources that never move
+    def __init__(self, downscale=4, darkness=255, smooth=True, static_tags=("lamp light",)):
+        self.downscale = downscale
+        self.darkness = darkness
+        self.smooth = smooth
+        self.static_tags = frozenset(static_tags)
+
+
+class Lightmap(object):
+
+    def __init__(self, view_w, view_h, settings=None):
+        self.settings = settings or LightmapSettings()
+        self.view_w = view_w
+        self.view_h = view_h
+
+        scale = self.settings.downscale
+        self.w = (view_w + scale - 1) // scale
+        self.h = (view_h + scale - 1) // scale
+
+        # light accumulated this frame and the cached light of the static sources, indexed [x, y]
+        self.light = numpy.zeros((self.w, self.h), numpy.float32)
+        self.static_light = numpy.zeros((self.w, self.h), numpy.float32)
+        self.static_key = None
+
+        # downscaled alpha of each light mask by surface id, with the surface kept alive
+        self.masks = dict()
+
+        # the small darkness surface and the overlay it is scaled into
+        self.small = Surface((self.w, self.h), pygame.SRCALPHA, 32)
+        self.small.fill((0, 0, 0, self.settings.darkness))
+        self.overlay = Surface((view_w, view_h), pygame.SRCALPHA, 32)
+
+        self.frames = 0
+        self.drawn = 0
+        self.culled = 0
+        self.static_hits = 0
+        self.seconds = 0.0
+
+    def mask(self, surface):
+        entry = self.masks.get(id(surface))
+        if entry is None:
+            scale = self.settings.downscale
+            w = max(1, surface.get_width() // scale)
+            h = max(1, surface.get_height() // scale)
+
+            small = transform.smoothscale(surface, (w, h))
+            entry = (surface, surfarray.array_alpha(small).astype(numpy.float32) / 255.0)
+            self.masks[id(surface)] = entry
+
+        return entry[1]
+
+    # bounds of the light's mask in world coordinates, as left, top, right, bottom
+    @staticmethod
+    def bounds(light):
+        position = light.transform.position
+        pivot = light.renderer.pivot
+        w, h = light.renderer.sprite.get_size()
+        left = position.x - pivot.x
+        top = position.y - pivot.y
+        return left, top, left + w, top + h
+
+    def visible(self, bounds, camera):
+        left, top, right, bottom = bounds
+        return (right > camera.x and left < camera.x + self.view_w and
+                bottom > camera.y and top < camera.y + self.view_h)
+
+    # adds the light's mask into the buffer, at its place relative to the camera
+    def add(self, buffer, light, bounds, camera):
+        mask = self.mask(light.renderer.sprite)
+        scale = self.settings.downscale
+
+        x = int(round((bounds[0] - camera.x) / scale))
+        y = int(round((bounds[1] - camera.y) / scale))
+
+        # clip the mask to the buffer
+        left = max(x, 0)
+        top = max(y, 0)
+        right = min(x + mask.shape[0], self.w)
+        bottom = min(y + mask.shape[1], self.h)
+
+        if left < right and top < bottom:
+            buffer[left:right, top:bottom] += mask[left - x:right - x, top - y:bottom - y]
+            self.drawn += 1
+
+    def composite(self, lights, camera):
+        start = time.time()
+        scale = self.settings.downscale
+
+        static = list()
+        dynamic = list()
+        for light in lights:
+            bounds = self.bounds(light)
+            if not self.visible(bounds, camera):
+                self.culled += 1
+            elif light.tag in self.settings.static_tags:
+                static.append((light, bounds))
+            else:
+                dynamic.append((light, bounds))
+
+        # the static lights only change when the camera moves a buffer pixel or one of them goes away
+        static_key = (int(round(camera.x / scale)), int(round(camera.y / scale)), tuple(id(light) for light, bounds in static))
+        if static_key == self.static_key:
+            self.static_hits += 1
+        else:
+            self.static_light.fill(0.0)
+            for light, bounds in static:
+                self.add(self.static_light, light, bounds, camera)
+            self.static_key = static_key
+
+        light_buffer = self.light
+        light_buffer[...] = self.static_light
+        for light, bounds in dynamic:
+            self.add(light_buffer, light, bounds, camera)
+
+        numpy.clip(light_buffer, 0.0, 1.0, out=light_buffer)
+
+        alpha = surfarray.pixels_alpha(self.small)
+        alpha[...] = (self.settings.darkness * (1.0 - light_buffer)).astype(numpy.uint8)
+        del alpha
+
+        if self.settings.smooth:
+            transform.smoothscale(self.small, (self.view_w, self.view_h), self.overlay)
+        else:
+            transform.scale(self.small, (self.view_w, self.view_h), self.overlay)
+
+        self.frames += 1
+        self.seconds += time.time() - start
+
+    def stats(self):
+        frames = max(self.frames, 1)
+        return {"buffer_size": (self.w, self.h),
+                "frames": self.frames,
+                "ms per frame": 1000.0 * self.seconds / frames,
+                "lights drawn per frame": self.drawn / float(frames),
+                "lights culled per frame": self.culled / float(frames),
+                "static cache hits": self.static_hits}
+
+
+# Composites the lightmap of the world every frame and keeps the overlay entity it is attached
+# to over the camera view.
+@frame_io_guard
+class LightmapRenderer(BehaviorScript):
+
+    def __init__(self, script_name, lightmap):
+        super(LightmapRenderer, self).__init__(script_name)
+        self.lightmap = lightmap
+
+    def update(self):
+        render = self.entity.world.get_system(RenderSystem.tag)
+
+        if render is None or render.camera is None:
+            return
+
+        position = render.camera.transform.position
+        self.lightmap.composite(render.light_sources, position)
+
+        self.entity.transform.position = Vector2(position.x, position.y)
+
+
+# Creates the entity that shows the lightmap over the world, and turns off the render system's
+# own dark environment.
+def create_lightmap_overlay(world, settings=None):
+    display = world.engine.display
+    lightmap = Lightmap(display.get_width(), display.get_height(), settings)
+
+    overlay = world.create_entity()
+    overlay.add_component(Transform(Vector2(0, 0)))
+    overlay.add_component(Renderer(lightmap.overlay, Vector2(0, 0)))
+    overlay.renderer.depth = OVERLAY_DEPTH
+    overlay.add_script(LightmapRenderer("lightmap renderer", lightmap))
+
+    world.get_system(RenderSystem.tag).simulate_dark_env = False
+    return lightmap
@@ -1,65 +1,122 @@
 __author__ = 'luisl_000'
 
+# imported first so that the startup timings include the imports
+from startup import timer, load_scene_phase
+
 from main_room import PlatformWorld
 from maze import Maze
 from fibpuzzle import FibWorld
 from engine import Engine
-from systems import RenderSystem
+from asset_cache import cache, load_image, CONVERT
+from bootstrap import EngineConfig, create_engine
+from snapshot import restore_initial_state
+from static_screen import StaticScreen
+from preloader import Preloader
+from music import music
+from headless import ThroughputRun
+from restart import RestartWorld
+
 
+import logging
 
 import pygame
-from pygame import QUIT
+
+timer.record_since_start("import")
+
+logger = logging.getLogger(__name__)
 
 
 class Game(object):
 
-    def __init__(self):
+    def __init__(self, config=None):
+
+        self.config = config if config is not None else EngineConfig()
 
         self.engine = None
         self.main_room = None
         self.maze_room = None
         self.fib_room = None
 
-    def start(self):
+        # the worlds are restored from here, see restart
+        self.restart_room = None
 
-        self.engine = Engine(1200, 700)
+        self.restart_pending = False
 
-        self.engine.game = self
-
-        screen = pygame.display.set_mode((1200, 700), pygame.HWSURFACE, 32)
-        title_screen = pygame.image.load("assets/images/gui/title_screen.png").convert()
-
-        x = 1200/2 - title_screen.get_width()/2
-        y = 700/2 - title_screen.get_height()/2
+    def start(self):
 
-        # show title screen
-        exit_title_screen = False
-        while not exit_title_screen:
+        self.engine = create_engine(self.config)
 
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    Engine.clean_up()
+        self.engine.game = self
 
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        exit_title_screen = True
+        # decode the assets of every world while the title screen is up
+        preloader = Preloader()
+        for world_class in (PlatformWorld, Maze, FibWorld):
+            preloader.add_images(world_class.asset_manifest)
+            preloader.add_sounds(world_class.sound_manifest)
+            music.prefetch(world_class.music_track)
 
-            screen.fill((0, 0, 0))
-            screen.blit(title_screen, (x, y))
+        if not self.config.headless:
+            self.show_screen("assets/images/gui/title_screen.png", preloader.pump)
 
-            pygame.display.update()
+        with timer.phase("preload after the title screen"):
+            preloader.finish()
 
         self.main_room = PlatformWorld()
         self.maze_room = Maze()
         self.fib_room = FibWorld()
+        self.restart_room = RestartWorld()
 
         self.engine.worlds.append(self.main_room)
         self.engine.worlds.append(self.maze_room)
         self.engine.worlds.append(self.fib_room)
+        self.engine.worlds.append(self.restart_room)
+
+        # the maze and the fib puzzle are only loaded when they are first entered, the report waits for them
+        if self.config.startup_report:
+            logging.basicConfig(level=logging.INFO)
+            worlds = (self.main_room, self.maze_room, self.fib_room)
+            timer.when_recorded([load_scene_phase(world) for world in worlds], self.log_startup_report)
+
+        if self.config.headless:
+            worlds = [self.main_room, self.maze_room, self.fib_room]
+            throughput = ThroughputRun(self.engine, worlds, self.config.headless_ticks, Engine.clean_up)
+            throughput.start()
+        else:
+            self.engine.set_world(self.main_room)
 
-        self.engine.set_world(self.main_room)
         self.engine.run()
 
+    def log_startup_report(self):
+        timer.record("image decode (during the above)", cache.decode_time)
+        logger.info(timer.report())
+
+    # Restarts the game with the worlds that were already built. Script callbacks ask for it, so
+    # the worlds are reset from the restart world's update instead of right away.
+    def restart(self):
+        self.restart_pending = True
+        self.engine.set_world(self.restart_room)
+
+    # Puts every world back to how it was after it was loaded and goes back to the main room.
+    # Only called while none of the restored worlds is being updated.
+    def reset_worlds(self):
+        self.restart_pending = False
+
+        for world in self.engine.worlds:
+            restore_initial_state(world)
+
+        music.rewind_all()
+
+        self.engine.set_world(self.main_room)
+
+    # shows a full screen image until enter is pressed, on_tick can report progress of some work
+    # done in the meantime (see StaticScreen)
+    def show_screen(self, path, on_tick=None):
+        pygame.display.set_mode((self.config.width, self.config.height), pygame.HWSURFACE, 32)
+        image = load_image(path, CONVERT)
+
+        screen = StaticScreen(image, on_quit=Engine.clean_up, on_tick=on_tick)
+        screen.show()
+
     def go_to_maze(self):
         self.engine.set_world(self.maze_room)
 
@@ -70,30 +127,18 @@ class Game(object):
         self.engine.set_world(self.main_room)
 
     def go_to_end(self):
-        screen = pygame.display.set_mode((1200, 700), pygame.HWSURFACE, 32)
-        title_screen = pygame.image.load("assets/images/gui/end_screen.png").convert()
-
-        x = 1200/2 - title_screen.get_width()/2
-        y = 700/2 - title_screen.get_height()/2
-
-        # show title screen
-        exit_title_screen = False
-        while not exit_title_screen:
-
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    Engine.clean_up()
 
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        exit_title_screen = True
+        # the cabin keeps asking until the worlds are reset
+        if self.restart_pending:
+            return
 
-            screen.fill((0, 0, 0))
-            screen.blit(title_screen, (x, y))
+        if not self.config.headless:
+            self.show_screen("assets/images/gui/end_screen.png")
+            self.show_screen("assets/images/gui/title_screen.png")
 
-            pygame.display.update()
-        self.start()
+        self.restart()
 
 
-luminescence = Game()
-luminescence.start()
\ No newline at end of file
+if __name__ == "__main__":
+    luminescence = Game(EngineConfig())
+    luminescence.start()
\ No newline at end of file
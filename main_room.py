@@ -1,16 +1,38 @@
 
+import logging
+
 from world import *
 from engine import *
 
 from scripts import *
 from utility import *
 from state_machine import *
-
-engine = Engine(1200, 700)
-
-monster_appearance_sfx = mixer.Sound("assets/sound/piano_low_key.wav")
-
-
+from asset_cache import load_image, loads_manifest, frame_io_guard, CONVERT
+from snapshot import captures_initial_state
+from sounds import play_sound
+from music import music, UpdateMusic
+from tiling import TiledSurface, TiledRenderer, memory_report
+from sprite_sheets import rotation_frames
+from broadphase import Broadphase, UpdateBroadphase
+from contacts import ContactCache
+from entity_index import TagIndex, ScriptHandle
+from transition_signals import TransitionSignals
+from light_levels import LightMaskPyramid
+from timestep import FixedTimestep, frame_time
+from fixed_step import AdvanceClock, FixedStepMover
+from lightmap import LightmapSettings, create_lightmap_overlay, available as lightmap_available
+from collision_routing import CollisionRouter, set_collision_category, ALL
+from collision_routing import PLAYER, GROUND, TRIGGER, HAZARD, LADDER, MONSTER
+
+logger = logging.getLogger(__name__)
+
+MONSTER_APPEARANCE_SFX = "assets/sound/piano_low_key.wav"
+
+# tags of the entities the player can stand on
+GROUND_TAGS = frozenset(["floor", "box", "cabin", "wall", "platform"])
+
+
+@frame_io_guard
 class BookShelfInteraction(BehaviorScript):
 
     def __init__(self):
@@ -29,7 +51,13 @@ class BookShelfInteraction(BehaviorScript):
                 x_mouse = pygame.mouse.get_pos()[0]
                 y_mouse = pygame.mouse.get_pos()[1]
 
-                camera_pos = self.entity.world.get_system(RenderSystem.tag).camera.transform.position
+                render = self.entity.world.get_system(RenderSystem.tag)
+
+                # there is nothing to click on without a camera, such as in headless runs
+                if render is None or render.camera is None:
+                    return
+
+                camera_pos = render.camera.transform.position
 
                 # adjust to the camera
                 x_mouse += camera_pos.x
@@ -54,6 +82,7 @@ class BookShelfInteraction(BehaviorScript):
                 self.showing_hint = False
 
 
+@frame_io_guard
 class ExitMainRoom(WorldScript):
 
     def __init__(self):
@@ -67,18 +96,18 @@ class ExitMainRoom(WorldScript):
             self.puzzles_done = self.world.engine.game.fib_room.puzzle_finished and self.world.engine.game.maze_room.puzzle
 
         # elevator hasn't been triggered yet
-        elevator_cabin = self.world.get_entity_by_tag("cabin")
+        elevator_cabin = self.world.tag_index.first("cabin")
         if self.puzzles_done and elevator_cabin.collider.is_trigger:
-            elevator_cabin = self.world.get_entity_by_tag("cabin")
 
             # on the elevator cabin
             if PhysicsSystem.box2box_collision(self.world.player.collider, elevator_cabin.collider):
-                monster_appearance_sfx.play()
+                play_sound(MONSTER_APPEARANCE_SFX)
                 elevator_cabin.collider.is_trigger = False
                 elevator_cabin.collider.treat_as_dynamic = True
 
 
-class MoveCabin(BehaviorScript):
+@frame_io_guard
+class MoveCabin(FixedStepMover):
 
     def __init__(self):
         super(MoveCabin, self).__init__("move cabin")
@@ -91,14 +120,18 @@ class MoveCabin(BehaviorScript):
 
         # move up if activated
         if not self.entity.collider.is_trigger:
-            self.entity.transform.position.y -= self.speed * self.entity.world.engine.delta_time
-            self.timer_to_end -= self.entity.world.engine.delta_time
+            super(MoveCabin, self).update()
 
         if self.timer_to_end < 0:
             self.entity.world.engine.game.go_to_end()
 
+    def fixed_update(self, dt):
+        self.position.y -= self.speed * dt
+        self.timer_to_end -= dt
 
-class MonsterMovement(BehaviorScript):
+
+@frame_io_guard
+class MonsterMovement(FixedStepMover):
 
     def __init__(self):
         super(MonsterMovement, self).__init__("monster movement")
@@ -111,17 +144,18 @@ class MonsterMovement(BehaviorScript):
 
         # follow the player if he is alive
         if not self.killed_player:
-            player = self.entity.world.player
+            super(MonsterMovement, self).update()
 
-            direction = player.transform.position - self.entity.transform.position
-            direction.normalize()
+            # make the lamp follow the monster where it is drawn
+            self.entity.world.monster_light.transform.position = Vector2(self.shown[0], self.shown[1])
 
-            dt = self.entity.world.engine.delta_time
+    def fixed_update(self, dt):
+        player = self.entity.world.player
 
-            self.entity.transform.position += direction * self.speed * dt
+        direction = player.transform.position - self.position
+        direction.normalize()
 
-            # make the lamp follow the monster
-            self.entity.world.monster_light.transform.position = self.entity.transform.position
+        self.position += direction * self.speed * dt
 
     def take_input(self, event):
 
@@ -129,7 +163,7 @@ class MonsterMovement(BehaviorScript):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r:
                 if self.killed_player:
-                    self.entity.world.engine.game.start()
+                    self.entity.world.engine.game.restart()
 
     def collision_event(self, other_collider):
 
@@ -143,62 +177,74 @@ class MonsterMovement(BehaviorScript):
                 player.disabled = True
 
                 # display a red cross over the player to signify that he is dead
-                img = pygame.image.load("assets/images/effects/blood_splatter.png").convert_alpha()
+                img = load_image("assets/images/effects/blood_splatter.png")
                 splatter = self.entity.world.create_renderable_object(img)
                 splatter.renderer.depth = -100
+                self.entity.world.tag_index.add(splatter)
                 splatter.transform.position = self.entity.transform.position
                 self.killed_player = True
 
 
+@frame_io_guard
 class UpdateAnimationHandler(WorldScript):
 
-    def __init__(self, anim_state_machine):
+    def __init__(self, anim_state_machine, signals=None):
         super(UpdateAnimationHandler, self).__init__("animation handler")
         self.anim_state_machine = anim_state_machine
 
+        # signals the transitions depend on, without them the state machine is updated every frame
+        self.signals = signals
+
     def update(self):
-        self.anim_state_machine.update()
+        if self.signals is None:
+            self.anim_state_machine.update()
+        else:
+            self.signals.update(self.anim_state_machine)
 
         # make the lamp source follow the player
         self.world.lamp_source.transform.position = self.world.player.transform.position
 
 
-class TeleportCrate(BehaviorScript):
+@frame_io_guard
+class TeleportCrate(CollisionRouter):
 
     def __init__(self):
-        super(TeleportCrate, self).__init__("teleport crate")
+        super(TeleportCrate, self).__init__("teleport crate", TRIGGER)
 
-    # if the crate collides with a teleporter, spawn them from the ceilings at certain points
-    def collision_event(self, other_collider):
+        self.on_name("teleport b", self.teleport_b)
+        self.on_name("teleport a", self.teleport_a)
 
-        if other_collider.entity.name == "teleport b":
-            self.entity.transform.position = Vector2(540, -300)
+    # if the crate collides with a teleporter, spawn them from the ceilings at certain points
+    def teleport_b(self, other_collider):
+        self.entity.transform.position = Vector2(540, -300)
 
-        elif other_collider.entity.name == "teleport a":
-            self.entity.transform.position = Vector2(1800, -300)
+    def teleport_a(self, other_collider):
+        self.entity.transform.position = Vector2(1800, -300)
 
 
-class DeactivateSaw(BehaviorScript):
+@frame_io_guard
+class DeactivateSaw(CollisionRouter):
 
     def __init__(self):
-        super(DeactivateSaw, self).__init__("deactivate saw")
+        super(DeactivateSaw, self).__init__("deactivate saw", TRIGGER)
 
-    def collision_event(self, other_collider):
+        self.on_tag("saw switch", self.hit_switch)
 
-        if other_collider.entity.tag == "saw switch":
+    def hit_switch(self, other_collider):
 
-            new_switch_image = pygame.image.load("assets/images/tiles/56x100_switchON.png").convert()
+        new_switch_image = load_image("assets/images/tiles/56x100_switchON.png", CONVERT)
 
-            other_collider.entity.renderer.set_image(new_switch_image)
+        other_collider.entity.renderer.set_image(new_switch_image)
 
-            # get the saw
-            saw = self.entity.world.get_entity_by_tag("saw")
+        # get the saw
+        saw = self.entity.world.tag_index.first("saw")
 
-            saw.collider.is_trigger = True
-            saw.remove_component(Animator.tag)
+        saw.collider.is_trigger = True
+        saw.remove_component(Animator.tag)
 
 
 # This will handle the dimming of lamp light and regeneration of lamp light from the other lamps
+@frame_io_guard
 class HandleLightLife(BehaviorScript):
 
     def __init__(self):
@@ -215,25 +261,27 @@ class HandleLightLife(BehaviorScript):
 
         self.monster_spawned = False
 
+        # level of the lamp light mask that is showing
+        self.lamp_level = None
+
     def update(self):
-        # reduce lamp strength at every mutliple of 5
-        if self.lamp_life > 0 and int(self.lamp_life) % 5 == 0:
-            scale = self.lamp_life / self.max_lamp_life
-            self.entity.world.lamp_source.transform.scale_by(scale, scale)
+        # dim the lamp one level for every 5 seconds of lamp life used up
+        if self.lamp_life > 0:
+            self.show_lamp_level(self.entity.world.lamp_levels.level_for(int(self.lamp_life), self.max_lamp_life))
 
         # spawn monster
         if self.monster_appearance_timer < 0 and not self.monster_spawned:
-            monster_appearance_sfx.play()
+            play_sound(MONSTER_APPEARANCE_SFX)
             self.entity.world.initialize_monster()
             self.monster_spawned = True
 
         # start secondary timer for monster to appear
         if self.lamp_life < 0 < self.monster_appearance_timer:
-            self.monster_appearance_timer -= self.entity.world.engine.delta_time
+            self.monster_appearance_timer -= frame_time(self.entity.world)
 
         # reduce lamp life
         if self.lamp_life > 0:
-            self.lamp_life -= self.entity.world.engine.delta_time
+            self.lamp_life -= frame_time(self.entity.world)
 
     def take_input(self, event):
 
@@ -256,55 +304,122 @@ class HandleLightLife(BehaviorScript):
                             self.entity.world.disable_monster()
 
                         # set lamp source back to max capacity
-                        self.entity.world.lamp_source.transform.scale_by(1, 1)
+                        self.show_lamp_level(self.entity.world.lamp_levels.levels)
 
                         # destroy the lamp light that you obtained fuel from
+                        self.entity.world.broadphase.remove(lamp_light)
+                        self.entity.world.tag_index.remove(lamp_light)
                         self.entity.world.destroy_entity(lamp_light)
 
                         # remove from lamp lights list
                         self.entity.world.lamp_lights.remove(lamp_light)
 
                         # remove it from the renderer
-                        self.entity.world.get_system(RenderSystem.tag).light_sources.remove(lamp_light)
+                        render = self.entity.world.get_system(RenderSystem.tag)
+                        if render is not None:
+                            render.light_sources.remove(lamp_light)
 
                         self.monster_spawned = False
                         return
 
+    # swaps the lamp light for one of the precomputed sizes, only when the level changes
+    def show_lamp_level(self, level):
+        if level != self.lamp_level:
+            world = self.entity.world
+            world.lamp_levels.apply(world.lamp_source, level)
+            self.lamp_level = level
+
 
-class GoToOtherLevel(BehaviorScript):
+@frame_io_guard
+class GoToOtherLevel(CollisionRouter):
 
     def __init__(self):
-        super(GoToOtherLevel, self).__init__("go to other level")
+        super(GoToOtherLevel, self).__init__("go to other level", TRIGGER)
 
-    def collision_event(self, other_collider):
+        self.on_name("trigger to maze", self.enter_maze)
+        self.on_name("trigger to fib", self.enter_fib)
 
-        if other_collider.entity.name == "trigger to maze":
+    def enter_maze(self, other_collider):
 
-            # player will be falling down once he comes back from the maze
-            self.entity.rigid_body.velocity.zero()
-            self.entity.transform.position = Vector2(1100, -320)
+        # player will be falling down once he comes back from the maze
+        self.entity.rigid_body.velocity.zero()
+        self.entity.transform.position = Vector2(1100, -320)
 
-            self.entity.world.engine.game.go_to_maze()
+        self.entity.world.engine.game.go_to_maze()
 
-        elif other_collider.entity.name == "trigger to fib":
+    def enter_fib(self, other_collider):
 
-            # shift back the player a bit
-            self.entity.transform.position.x -= (self.entity.collider.box.w/2 + 10)
-            self.entity.rigid_body.velocity.zero()
+        # shift back the player a bit
+        self.entity.transform.position.x -= (self.entity.collider.box.w/2 + 10)
+        self.entity.rigid_body.velocity.zero()
 
-            self.entity.world.engine.game.go_to_fib()
+        self.entity.world.engine.game.go_to_fib()
 
 
 class PlatformWorld(World):
 
+    # background music, played by the music manager
+    music_track = "assets/music/MarysCreepyCarnivalTheme.ogg"
+
+    # every image used by the world and its scripts, decoded when the scene is loaded so that
+    # nothing is read from disk during the frame loop
+    asset_manifest = [
+        ("assets/images/gui/hint.png", CONVERT),
+        ("assets/images/backgrounds/eye_duck.png", CONVERT),
+        ("assets/images/backgrounds/horse.png", CONVERT),
+        ("assets/images/backgrounds/all_toys.png", CONVERT),
+        ("assets/images/backgrounds/no_toys.png", CONVERT),
+        ("assets/images/environment/bookcase.png", CONVERT),
+        ("assets/images/tiles/56x100_switchOFF.png", CONVERT),
+        ("assets/images/tiles/56x100_switchON.png", CONVERT),
+        "assets/images/lights/lamp_light_xsmall_mask.png",
+        "assets/images/lights/lamp_light_small_mask.png",
+        "assets/images/lights/lamp_light_mask.png",
+        "assets/images/environment/lamp.png",
+        "assets/images/environment/hazards/saw.png",
+        "assets/images/environment/hazards/monster.png",
+        "assets/images/effects/blood_splatter.png",
+        "assets/images/ladders/ladder_body.png",
+        "assets/images/ladders/ladder_top.png",
+        "assets/images/platforms/30x200.png",
+        "assets/images/platforms/30x400.png",
+        "assets/images/platforms/50x250.png",
+        "assets/images/platforms/120x400.png",
+        "assets/images/platforms/150x800.png",
+        "assets/images/platforms/50x300.png",
+        "assets/images/platforms/50x140.png",
+        "assets/images/platforms/50x180.png",
+        "assets/images/walls/200x500.png",
+        "assets/images/walls/200x350.png",
+        "assets/images/walls/200x200.png",
+        "assets/images/walls/170x600.png",
+        "assets/images/floors/floor_tile.png",
+        "assets/images/environment/elevator/elevator_shaft.png",
+        "assets/images/environment/elevator/extended_elevator.png",
+        "assets/images/crates/red_green.png",
+        "assets/images/crates/gold_blue.png",
+        "assets/images/crates/blue_green.png",
+        "assets/images/crates/blue_red.png"
+    ]
+
+    # sound effects, decoded ahead of time by the preloader
+    sound_manifest = [MONSTER_APPEARANCE_SFX]
+
     def __init__(self):
         super(PlatformWorld, self).__init__()
 
         self.player = None
         self.player_anim_handler = None
+        self.player_anim_signals = None
 
         self.ladders = list()
         self.lamp_source = None
+        self.lamp_levels = None
+
+        # quality of the lightmap that darkens the room, and the lightmap once it is created
+        self.lightmap_settings = LightmapSettings()
+        self.lightmap = None
+
         self.crates = list()
 
         # object that determine if the player should be grounded
@@ -318,17 +433,32 @@ class PlatformWorld(World):
 
         self.book_shelves = list()
 
+        # scripts drawing the visible part of the tiled floors and ceilings
+        self.tiled_renderers = list()
+
+        # colliders indexed on a grid, for scripts that look for colliders around a box
+        self.broadphase = None
+
+        # contacts of the colliders in the current frame, such as the player with the ground
+        self.contacts = None
+
+        # entities by tag, for the lookups done every frame
+        self.tag_index = TagIndex(self)
+
+        # fixed ticks for the entities that scripts move
+        self.clock = None
+
         self.text = None
 
     def resume(self):
-        # load music to play in the background
-        mixer.music.load("assets/music/MarysCreepyCarnivalTheme.ogg")
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.3)
+        # continue the world's music from where it was left
+        music.play(self.music_track)
 
+    @captures_initial_state
+    @loads_manifest
     def load_scene(self):
 
-        img = pygame.image.load("assets/images/gui/hint.png").convert()
+        img = load_image("assets/images/gui/hint.png", CONVERT)
         self.text = self.engine.gui.Widget(img, Vector2(0, 0))
 
         w = self.engine.display.get_width()
@@ -348,11 +478,13 @@ class PlatformWorld(World):
         trigger_to_maze.collider.is_trigger = True
         trigger_to_maze.transform.position = Vector2(-90, 70)
         trigger_to_maze.name = "trigger to maze"
+        set_collision_category(trigger_to_maze.collider, TRIGGER)
 
         trigger_to_fib = self.create_box_collider_object(200, 200)
         trigger_to_fib.collider.is_trigger = True
         trigger_to_fib.transform.position = Vector2(4700, 370)
         trigger_to_fib.name = "trigger to fib"
+        set_collision_category(trigger_to_fib.collider, TRIGGER)
 
         self.load_backgrounds()
         self.load_player()
@@ -378,13 +510,29 @@ class PlatformWorld(World):
         render.camera.add_component(Transform(Vector2(0, 0)))
         render.camera.add_script(CameraFollow("camera follow", self.player.transform, w, h))
 
-        # start the background music and set it to loop forever
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.3)
+        # composite the lights with NumPy when it is installed, otherwise the render system does it
+        if lightmap_available():
+            self.lightmap = create_lightmap_overlay(self, self.lightmap_settings)
+
+        # every entity is tagged by now, the scripts tell the index about the changes from here on
+        self.tag_index.build()
+
+        # the monster and the elevator cabin are moved by their scripts
+        self.broadphase = Broadphase(self)
+        self.broadphase.build_static([self.monster, self.tag_index.first("cabin")])
+        self.contacts = ContactCache(self.broadphase)
+        self.add_script(UpdateBroadphase())
+
+        self.clock = FixedTimestep()
+        self.add_script(AdvanceClock())
+
+        # start the background music, it loops forever
+        self.add_script(UpdateMusic())
+        music.play(self.music_track)
 
         self.get_system(PhysicsSystem.tag).gravity.y += 200
 
-        self.add_script(UpdateAnimationHandler(self.player_anim_handler))
+        self.add_script(UpdateAnimationHandler(self.player_anim_handler, self.player_anim_signals))
 
         # get all the lamp lights
         for e in self.entity_manager.entities:
@@ -400,23 +548,29 @@ class PlatformWorld(World):
 
         self.add_script(ExitMainRoom())
 
+        logger.info("tiled floors and ceilings: %s", self.tiling_memory_report())
+        logger.info("lamp light levels: %s", self.lamp_memory_report())
+
     def load_lights(self):
 
         render_sys = self.get_system(RenderSystem.tag)
 
         # a light source to see the monster
-        lamp_light_img = pygame.image.load("assets/images/lights/lamp_light_xsmall_mask.png").convert_alpha()
+        lamp_light_img = load_image("assets/images/lights/lamp_light_xsmall_mask.png")
         self.monster_light = self.create_renderable_object(lamp_light_img)
         self.monster_light.renderer.depth = 10000
 
         # lamp light for the player
-        large_lamp_light_img = pygame.image.load("assets/images/lights/lamp_light_mask.png").convert_alpha()
+        large_lamp_light_img = load_image("assets/images/lights/lamp_light_mask.png")
         self.lamp_source = self.create_renderable_object(large_lamp_light_img)
         self.lamp_source.renderer.depth = 10000
         render_sys.light_sources.append(self.lamp_source)
 
-        lamp_light_img = pygame.image.load("assets/images/lights/lamp_light_small_mask.png").convert_alpha()
-        lamp_img = pygame.image.load("assets/images/environment/lamp.png").convert_alpha()
+        # the sizes the lamp light dims through
+        self.lamp_levels = LightMaskPyramid(large_lamp_light_img)
+
+        lamp_light_img = load_image("assets/images/lights/lamp_light_small_mask.png")
+        lamp_img = load_image("assets/images/environment/lamp.png")
 
         # LAMP AT WALL A
         lamp = self.create_renderable_object(lamp_img)
@@ -460,12 +614,13 @@ class PlatformWorld(World):
 
     def load_saw(self):
 
-        img = pygame.image.load("assets/images/environment/hazards/saw.png").convert_alpha()
+        img = load_image("assets/images/environment/hazards/saw.png")
         saw = self.create_game_object(img)
         saw.transform.scale_by(0.75, 0.75)
         saw.renderer.depth = 70
         saw.transform.position = Vector2(3200, 480)
         saw.tag = "saw"
+        set_collision_category(saw.collider, HAZARD)
 
         animator = Animator()
         saw.add_component(animator)
@@ -473,24 +628,13 @@ class PlatformWorld(World):
         anim = Animator.Animation()
         anim.frame_latency = 0.01
 
-        # create multiple rotating frames for the saw
-        for degree in range(0, 360, 360/15):
-
-            #obtain original dimensions
-            original_rect = saw.renderer.sprite.get_rect()
-            rotated_surface = pygame.transform.rotate(saw.renderer.sprite, degree)
-
-            #adjust new surface's center with the original's
-            rotate_rect = original_rect.copy()
-            rotate_rect.center = rotated_surface.get_rect().center
-
-            rotated_surface = rotated_surface.subsurface(rotate_rect).copy()
-
-            anim.add_frame(rotated_surface)
+        # multiple rotating frames of the scaled saw, built once and cached on disk
+        for frame in rotation_frames("assets/images/environment/hazards/saw.png", 15, 0.75, saw.renderer.sprite):
+            anim.add_frame(frame)
 
         animator.set_animation(anim)
 
-        img = pygame.image.load("assets/images/tiles/56x100_switchOFF.png").convert()
+        img = load_image("assets/images/tiles/56x100_switchOFF.png", CONVERT)
 
         # add the switch to deactivate lever
         switch = self.create_game_object(img)
@@ -498,10 +642,11 @@ class PlatformWorld(World):
         switch.transform.position = Vector2(2050, -120)
         switch.renderer.depth = 70
         switch.tag = "saw switch"
+        set_collision_category(switch.collider, TRIGGER)
 
     def load_book_shelves(self):
 
-        img = pygame.image.load("assets/images/environment/bookcase.png").convert()
+        img = load_image("assets/images/environment/bookcase.png", CONVERT)
         w = img.get_width()
         h = img.get_height()
         pivot = Vector2(w/2, h/2)
@@ -538,14 +683,14 @@ class PlatformWorld(World):
         background.renderer.is_static = True
 
         path = "assets/images/backgrounds/"
-        img = pygame.image.load(path + "eye_duck.png").convert()
+        img = load_image(path + "eye_duck.png", CONVERT)
         background = self.create_renderable_object(img)
         background.renderer.pivot = Vector2(0, 0)
         #background = self.create_box_collider_object()
         background.renderer.depth = 100
         background.transform.position = Vector2(200, 0)
 
-        img = pygame.image.load(path + "horse.png").convert()
+        img = load_image(path + "horse.png", CONVERT)
         background = self.create_renderable_object(img)
         background.renderer.pivot = Vector2(0, 0)
         background.renderer.depth = 100
@@ -554,13 +699,13 @@ class PlatformWorld(World):
         background.transform.position = Vector2(x, -200)
 
         w = img.get_width()
-        img = pygame.image.load(path + "all_toys.png").convert()
+        img = load_image(path + "all_toys.png", CONVERT)
         background = self.create_renderable_object(img)
         background.renderer.pivot = Vector2(0, 0)
         background.renderer.depth = 100
         background.transform.position = Vector2(x + w, -200)
 
-        img = pygame.image.load(path + "no_toys.png").convert()
+        img = load_image(path + "no_toys.png", CONVERT)
         background = self.create_renderable_object(img)
         background.renderer.pivot = Vector2(0, 0)
         background.renderer.depth = 100
@@ -568,9 +713,8 @@ class PlatformWorld(World):
 
     def load_ladders(self):
         path = "assets/images/ladders/"
-        load = pygame.image.load
-        ladder_body = load(path + "ladder_body.png").convert_alpha()
-        ladder_top = load(path + "ladder_top.png").convert_alpha()
+        ladder_body = load_image(path + "ladder_body.png")
+        ladder_top = load_image(path + "ladder_top.png")
 
         shift = 200
 
@@ -582,15 +726,14 @@ class PlatformWorld(World):
 
         path = "assets/images/platforms/"
 
-        load = pygame.image.load
 
-        img_200x30 = load(path + "30x200.png").convert_alpha()
-        img_400x30 = load(path + "30x400.png").convert_alpha()
-        img_250x50 = load(path + "50x250.png").convert_alpha()
-        img_400x120 = load(path + "120x400.png").convert_alpha()
-        # img_300x30 = load(path + "30x300.png").convert_alpha()
-        img_800x150 = load(path + "150x800.png").convert_alpha()
-        img_300x50 = load(path + "50x300.png").convert_alpha()
+        img_200x30 = load_image(path + "30x200.png")
+        img_400x30 = load_image(path + "30x400.png")
+        img_250x50 = load_image(path + "50x250.png")
+        img_400x120 = load_image(path + "120x400.png")
+        # img_300x30 = load_image(path + "30x300.png")
+        img_800x150 = load_image(path + "150x800.png")
+        img_300x50 = load_image(path + "50x300.png")
 
         plat_a = self.create_game_object(img_200x30)
         plat_a.transform.position = Vector2(300, 250+50+50)
@@ -638,12 +781,11 @@ class PlatformWorld(World):
 
         path = "assets/images/walls/"
 
-        load = pygame.image.load
 
-        img_200x500 = load(path + "200x500.png").convert_alpha()
-        img_200x350 = load(path + "200x350.png").convert_alpha()
-        img_200x200 = load(path + "200x200.png").convert_alpha()
-        img_600x170 = load(path + "170x600.png").convert_alpha()
+        img_200x500 = load_image(path + "200x500.png")
+        img_200x350 = load_image(path + "200x350.png")
+        img_200x200 = load_image(path + "200x200.png")
+        img_600x170 = load_image(path + "170x600.png")
 
         wall_a = self.create_game_object(img_200x500)
         wall_a.transform.position = Vector2(100, 350+75)
@@ -665,49 +807,68 @@ class PlatformWorld(World):
         wall_e.transform.position = Vector2(4600, 0)
         set_wall_attributes(wall_e)
 
+    # Creates a solid object of the given size covered by the tile. Only the tiles in view of the
+    # camera are drawn, so the full size image is never created.
+    def create_tiled_object(self, tile, width, height, flip_y=False):
+
+        w = self.engine.display.get_width()
+        h = self.engine.display.get_height()
+
+        tiled = TiledSurface(tile, width, height, flip_y)
+        window = tiled.create_window(w, h)
+
+        tiled_object = self.create_box_collider_object(width, height)
+        tiled_object.add_component(Renderer(window, Vector2(width/2, height/2)))
+
+        tiled_renderer = TiledRenderer("tiled renderer", tiled, window)
+        tiled_object.add_script(tiled_renderer)
+        self.tiled_renderers.append(tiled_renderer)
+
+        return tiled_object
+
+    # memory of the tiled floors and ceilings compared to baking their full images
+    def tiling_memory_report(self):
+        return memory_report(self.tiled_renderers)
+
+    def lamp_memory_report(self):
+        return self.lamp_levels.memory_report()
+
     def load_floors(self):
 
         w = self.engine.display.get_width()
         h = self.engine.display.get_height()
 
-        floor_tile = pygame.image.load("assets/images/floors/floor_tile.png").convert_alpha()
+        floor_tile = load_image("assets/images/floors/floor_tile.png")
 
-        img = create_img_from_tile(floor_tile, w*2, 200)
-        floor_a = self.create_game_object(img)
+        floor_a = self.create_tiled_object(floor_tile, w*2, 200)
         floor_a.transform.position = Vector2(w, h)
         set_floor_attributes(floor_a)
 
-        img = create_img_from_tile(floor_tile, 1000, 200)
         x = w*2 + 100 + 500 + 50
-        floor_b = self.create_game_object(img)
+        floor_b = self.create_tiled_object(floor_tile, 1000, 200)
         floor_b.transform.position = Vector2(x, h)
         set_floor_attributes(floor_b)
 
         x += 250 + 800 + 150
-        floor_c = self.create_game_object(img)
+        floor_c = self.create_tiled_object(floor_tile, 1000, 200)
         floor_c.transform.position = Vector2(x, h)
         set_floor_attributes(floor_c)
 
     def load_ceilings(self):
 
         w = self.engine.display.get_width()
-        floor_tile = pygame.image.load("assets/images/floors/floor_tile.png").convert_alpha()
+        floor_tile = load_image("assets/images/floors/floor_tile.png")
 
-        img = create_img_from_tile(floor_tile, w*2, 200)
-        img = pygame.transform.flip(img, False, True)
-        ceil_a = self.create_game_object(img)
+        # ceilings are the floor tiles upside down
+        ceil_a = self.create_tiled_object(floor_tile, w*2, 200, flip_y=True)
         ceil_a.transform.position = Vector2(w, -470)
         set_ceiling_attributes(ceil_a)
 
-        img = create_img_from_tile(floor_tile, 1200, 400)
-        img = pygame.transform.flip(img, False, True)
-        ceil_b = self.create_game_object(img)
+        ceil_b = self.create_tiled_object(floor_tile, 1200, 400, flip_y=True)
         ceil_b.transform.position = Vector2(w*2 + 500, -350)
         set_ceiling_attributes(ceil_b)
 
-        img = create_img_from_tile(floor_tile, 1150, 200)
-        img = pygame.transform.flip(img, False, True)
-        ceil_c = self.create_game_object(img)
+        ceil_c = self.create_tiled_object(floor_tile, 1150, 200, flip_y=True)
         ceil_c.transform.position = Vector2(w*2 + 1650, -470)
         set_ceiling_attributes(ceil_c)
 
@@ -731,6 +892,7 @@ class PlatformWorld(World):
 
         self.player.collider.set_box(40, 70)
         self.player.collider.set_offset(-12, 10)
+        set_collision_category(self.player.collider, PLAYER)
 
         self.player.add_script(PlayerClimbing("player climb"))
         self.player.add_script(PlayerPlatformMovement("player plat move"))
@@ -746,8 +908,8 @@ class PlatformWorld(World):
 
         path = "assets/images/platforms/"
 
-        img_140x50 = pygame.image.load(path + "50x140.png").convert_alpha()
-        img_180x50 = pygame.image.load(path + "50x180.png").convert_alpha()
+        img_140x50 = load_image(path + "50x140.png")
+        img_180x50 = load_image(path + "50x180.png")
 
         # create elevator platforms
         for i in range(0, 4):
@@ -757,6 +919,8 @@ class PlatformWorld(World):
 
             platform.transform.position = Vector2(x, 700 - i*200)
             set_platform_attributes(platform)
+            # the ceiling, which is ground too, sends the platform back down
+            set_collision_category(platform.collider, GROUND, ALL)
             platform.add_script(ElevatorPlatMovement(spawn_point, "elev move"))
             platform.collider.treat_as_dynamic = True
 
@@ -767,6 +931,8 @@ class PlatformWorld(World):
 
             platform.transform.position = Vector2(x, 700 - i*200)
             set_platform_attributes(platform)
+            # the ceiling, which is ground too, sends the platform back down
+            set_collision_category(platform.collider, GROUND, ALL)
             platform.add_script(ElevatorPlatMovement(spawn_point, "elev move"))
             platform.collider.treat_as_dynamic = True
 
@@ -775,16 +941,18 @@ class PlatformWorld(World):
         teleport_a.collider.is_trigger = True
         teleport_a.transform.position = Vector2(2475, -280)
         teleport_a.name = "teleport a"
+        set_collision_category(teleport_a.collider, TRIGGER)
 
         teleport_b = self.create_box_collider_object(200, 200)
         teleport_b.collider.is_trigger = True
         teleport_b.transform.position = Vector2(3650, -490)
         teleport_b.name = "teleport b"
+        set_collision_category(teleport_b.collider, TRIGGER)
 
         # the elevator shaft
         path = "assets/images/environment/elevator/"
 
-        elev_shaft_img = pygame.image.load(path + "elevator_shaft.png").convert_alpha()
+        elev_shaft_img = load_image(path + "elevator_shaft.png")
         elevator_shaft = self.create_renderable_object(elev_shaft_img)
 
         y = elev_shaft_img.get_width()-150
@@ -792,7 +960,7 @@ class PlatformWorld(World):
         elevator_shaft.add_component(Transform(Vector2(1100, y)))
         elevator_shaft.renderer.depth = 50
 
-        elevator_cabin_img = pygame.image.load(path + "extended_elevator.png").convert_alpha()
+        elevator_cabin_img = load_image(path + "extended_elevator.png")
         elevator_cabin = self.create_renderable_object(elevator_cabin_img)
         elevator_cabin.add_component(Transform(Vector2(1100, y + elevator_cabin_img.get_height() + 100)))
         elevator_cabin.renderer.depth = 40
@@ -806,28 +974,28 @@ class PlatformWorld(World):
         elevator_cabin.add_script(MoveCabin())
 
     def load_boxes(self):
-        box_img = pygame.image.load("assets/images/crates/red_green.png").convert_alpha()
+        box_img = load_image("assets/images/crates/red_green.png")
         box = self.create_game_object(box_img)
         box.transform.position = Vector2(900, 560)
         set_box_attributes(box)
         box.add_script(TeleportCrate())
         self.crates.append(box)
 
-        box_img = pygame.image.load("assets/images/crates/gold_blue.png").convert_alpha()
+        box_img = load_image("assets/images/crates/gold_blue.png")
         box = self.create_game_object(box_img)
         box.transform.position = Vector2(540, 400)
         set_box_attributes(box)
         box.add_script(TeleportCrate())
         self.crates.append(box)
 
-        box_img = pygame.image.load("assets/images/crates/blue_green.png").convert_alpha()
+        box_img = load_image("assets/images/crates/blue_green.png")
         box = self.create_game_object(box_img)
         box.transform.position = Vector2(1300, -320)
         set_box_attributes(box)
         box.add_script(TeleportCrate())
         self.crates.append(box)
 
-        box_img = pygame.image.load("assets/images/crates/blue_red.png").convert_alpha()
+        box_img = load_image("assets/images/crates/blue_red.png")
         box = self.create_game_object(box_img)
         box.transform.position = Vector2(2475, 300)
         set_box_attributes(box)
@@ -847,27 +1015,27 @@ class PlatformWorld(World):
         anim.frame_latency = 0.18
 
         # create a state and load it to the state machine
-        state = AnimationStateMachine.AnimationState("idle", anim)
-        self.player_anim_handler.add_state(state)
+        idle = AnimationStateMachine.AnimationState("idle", anim)
+        self.player_anim_handler.add_state(idle)
 
         # setup the walk animation
         anim = load_anim_from_directory(path_to_anims + "Walking/")
         anim.frame_latency = 0.083
-        state = AnimationStateMachine.AnimationState("walking", anim)
-        self.player_anim_handler.add_state(state)
+        walking = AnimationStateMachine.AnimationState("walking", anim)
+        self.player_anim_handler.add_state(walking)
 
         # add jump animation
         anim = load_anim_from_directory(path_to_anims + "Jumping/")
         anim.frame_latency = 0.12
         anim.cycle = False
-        state = AnimationStateMachine.AnimationState("jumping", anim)
-        self.player_anim_handler.add_state(state)
+        jumping = AnimationStateMachine.AnimationState("jumping", anim)
+        self.player_anim_handler.add_state(jumping)
 
         # climb animation
         anim = load_anim_from_directory(path_to_anims + "Climbing/")
         anim.frame_latency = 0.12
-        state = AnimationStateMachine.AnimationState("climbing", anim)
-        self.player_anim_handler.add_state(state)
+        climbing = AnimationStateMachine.AnimationState("climbing", anim)
+        self.player_anim_handler.add_state(climbing)
 
         self.player_anim_handler.set_current_state("idle")
 
@@ -877,24 +1045,50 @@ class PlatformWorld(World):
         jump_transition = StateMachine.Transition()
         climb_transition = StateMachine.Transition()
 
-        # add conditions to the transitions
+        # the player's scripts are added after the animations, they are looked up on first use
+        plat_move = ScriptHandle("player plat move", self.player)
+        climb = ScriptHandle("player climb", self.player)
+
         # test to see if the player is moving on the x-axis
         min_speed_to_walk = 60
 
-        walk_transition.add_condition(lambda: abs(self.player.rigid_body.velocity.x) > min_speed_to_walk)
-        walk_transition.add_condition(lambda: self.player.get_script("player plat move").moving)
-        walk_transition.add_condition(lambda: self.player.get_script("player plat move").grounded)
-        walk_transition.add_condition(lambda: not self.player.get_script("player climb").climbing)
+        # everything the transitions depend on, the state machine is only updated when one of these changes
+        signals = TransitionSignals()
+        signals.add("above walk speed", lambda: abs(self.player.rigid_body.velocity.x) > min_speed_to_walk)
+        signals.add("below walk speed", lambda: abs(self.player.rigid_body.velocity.x) < min_speed_to_walk)
+        signals.add("moving", lambda: plat_move.get().moving)
+        signals.add("grounded", lambda: plat_move.get().grounded)
+        signals.add("climbing", lambda: climb.get().climbing)
+        # the player only climbs while on a ladder, so the ladder is only looked for while climbing
+        signals.add("on ladder", lambda: climb.get().colliding_with_ladder(), when="climbing")
+        self.player_anim_signals = signals
+
+        # add conditions to the transitions
+        walk_transition.add_condition(signals.condition("above walk speed"))
+        walk_transition.add_condition(signals.condition("moving"))
+        walk_transition.add_condition(signals.condition("grounded"))
+        walk_transition.add_condition(signals.condition("climbing", False))
+
+        idle_transition.add_condition(lambda: signals.get("below walk speed") or not signals.get("moving"))
+        idle_transition.add_condition(signals.condition("grounded"))
+        idle_transition.add_condition(signals.condition("climbing", False))
+
+        jump_transition.add_condition(signals.condition("grounded", False))
+        jump_transition.add_condition(signals.condition("climbing", False))
 
-        idle_transition.add_condition(lambda: abs(self.player.rigid_body.velocity.x) < min_speed_to_walk or not self.player.get_script("player plat move").moving)
-        idle_transition.add_condition(lambda: self.player.get_script("player plat move").grounded)
-        idle_transition.add_condition(lambda: not self.player.get_script("player climb").climbing)
+        climb_transition.add_condition(signals.condition("on ladder"))
+        climb_transition.add_condition(signals.condition("climbing"))
 
-        jump_transition.add_condition(lambda: not self.player.get_script("player plat move").grounded)
-        jump_transition.add_condition(lambda: not self.player.get_script("player climb").climbing)
+        # the signals read by the transitions out of each state, the others aren't sampled in it
+        to_walk = ("above walk speed", "moving", "grounded", "climbing")
+        to_idle = ("below walk speed", "moving", "grounded", "climbing")
+        to_jump = ("grounded", "climbing")
+        to_climb = ("on ladder", "climbing")
 
-        climb_transition.add_condition(lambda: self.player.get_script("player climb").colliding_with_ladder())
-        climb_transition.add_condition(lambda: self.player.get_script("player climb").climbing)
+        signals.read_in(idle, to_walk + to_jump + to_climb)
+        signals.read_in(walking, to_idle + to_jump + to_climb)
+        signals.read_in(jumping, to_idle + to_walk + to_climb)
+        signals.read_in(climbing, to_idle + to_walk + to_jump)
 
         # set up transitions between states
         self.player_anim_handler.add_bi_transition("idle", "walking", walk_transition, idle_transition)
@@ -923,6 +1117,7 @@ class PlatformWorld(World):
         ladder.renderer.depth = 3
 
         ladder.tag = "ladder"
+        set_collision_category(ladder.collider, LADDER)
 
         self.ladders.append(ladder)
 
@@ -930,7 +1125,7 @@ class PlatformWorld(World):
 
         render_sys = self.get_system(RenderSystem.tag)
 
-        img = pygame.image.load("assets/images/environment/hazards/monster.png").convert_alpha()
+        img = load_image("assets/images/environment/hazards/monster.png")
         w = img.get_width()
         h = img.get_height()
         pivot = Vector2(w/2, h/2)
@@ -939,19 +1134,22 @@ class PlatformWorld(World):
         self.monster.add_component(BoxCollider(50, 50))
         self.monster.add_script(MonsterMovement())
         self.monster.collider.is_trigger = True
+        set_collision_category(self.monster.collider, MONSTER)
         self.monster.renderer.depth = -10
 
-        # insert to scene
-        render_sys.dynamic_insertion_to_scene(self.monster)
-        render_sys.light_sources.append(self.monster_light)
+        # insert to scene, unless nothing is drawn
+        if render_sys is not None:
+            render_sys.dynamic_insertion_to_scene(self.monster)
+            render_sys.light_sources.append(self.monster_light)
 
     # Make the monster invisible and unable to interact with
     def disable_monster(self):
         # remove from the render system
         render_sys = self.get_system(RenderSystem.tag)
-        render_sys.remove_from_scene(self.monster)
-        render_sys.remove_from_scene(self.monster_light)
-        render_sys.light_sources.remove(self.monster_light)
+        if render_sys is not None:
+            render_sys.remove_from_scene(self.monster)
+            render_sys.remove_from_scene(self.monster_light)
+            render_sys.light_sources.remove(self.monster_light)
 
         self.monster.remove_component(Renderer.tag)
         self.monster.remove_component(BoxCollider.tag)
@@ -959,8 +1157,7 @@ class PlatformWorld(World):
 
     # test to see if the entity is considered as ground in the world
     def is_ground(self, entity):
-        e = entity
-        return e.tag == "floor" or e.tag == "box" or e.tag == "cabin" or e.tag == "wall" or e.tag == "platform"
+        return entity.tag in GROUND_TAGS
 
 # p = PlatformWorld()
 # engine.set_world(p)
@@ -0,0 +1,174 @@
+
+# Background music shared by the worlds. Tracks are read into memory ahead of time, so switching
+# worlds never waits on the disk, every track remembers where it was when it was left, and the
+# switch fades the old track out and the new one in over a few frames instead of blocking.
+#
+# pygame only streams one music track at a time, so the fade goes through silence rather than
+# overlapping both tracks.
+
+import struct
+import threading
+from io import BytesIO
+
+import pygame
+from pygame import mixer
+
+from components import WorldScript
+from asset_cache import frame_io_guard, check_frame_io
+
+DEFAULT_VOLUME = 0.3
+
+# seconds to fade out, and then to fade in
+FADE_TIME = 0.4
+
+
+# Length in seconds of an ogg vorbis file, from the sample rate in its header and the sample
+# position of its last page. None if the data can't be read that way.
+def ogg_length(data):
+    header = data.find(b"\x01vorbis")
+    last_page = data.rfind(b"OggS")
+
+    if header < 0 or last_page < 0 or len(data) < last_page + 14:
+        return None
+
+    rate = struct.unpack("<I", data[header + 12:header + 16])[0]
+    samples = struct.unpack("<q", data[last_page + 6:last_page + 14])[0]
+
+    if rate <= 0 or samples <= 0:
+        return None
+
+    return samples / float(rate)
+
+
+class MusicManager(object):
+
+    def __init__(self, volume=DEFAULT_VOLUME, fade_time=FADE_TIME):
+        self.volume = volume
+        self.fade_time = fade_time
+
+        # contents of the track files by path, and the threads reading them
+        self.tracks = dict()
+        self.readers = dict()
+
+        # where each track was left, in seconds
+        self.positions = dict()
+
+        # track that is playing and the one that was asked for
+        self.current = None
+        self.target = None
+
+        # position the current track was started at, and the stream it plays from
+        self.started_at = 0.0
+        self.stream = None
+
+        # fade of the current track, from 0 (silent) to 1
+        self.level = 0.0
+        self.applied_volume = None
+
+    # reads the track on a background thread
+    def prefetch(self, path):
+        if path in self.tracks or path in self.readers:
+            return
+
+        reader = threading.Thread(target=self.read, args=(path,))
+        reader.daemon = True
+        self.readers[path] = reader
+        reader.start()
+
+    def read(self, path):
+        with open(path, "rb") as track_file:
+            self.tracks[path] = track_file.read()
+
+    def data(self, path):
+        reader = self.readers.get(path)
+        if reader is not None and reader.is_alive():
+            check_frame_io(path, "music track waited on")
+            reader.join()
+
+        if path not in self.tracks:
+            check_frame_io(path, "music track read")
+            self.read(path)
+
+        return self.tracks[path]
+
+    # how far into the current track we are, in seconds
+    def position(self):
+        if self.current is None:
+            return 0.0
+
+        position = self.started_at + max(mixer.music.get_pos(), 0) / 1000.0
+
+        # the tracks loop
+        length = ogg_length(self.data(self.current))
+        if length:
+            position %= length
+
+        return position
+
+    # Asks for the track to be played, from where it was left. Nothing is loaded here; the
+    # switch happens over the next updates.
+    def play(self, path):
+        self.target = path
+
+    # forgets where the tracks were left, so they start over the next time they play
+    def rewind_all(self):
+        self.positions.clear()
+
+        if self.current is not None:
+            self.positions[self.current] = 0.0
+            self.current = None
+
+    def switch(self):
+        if self.current is not None:
+            self.positions[self.current] = self.position()
+
+        start = self.positions.get(self.target, 0.0)
+
+        # keep a reference to the stream, the mixer reads from it while it plays
+        self.stream = BytesIO(self.data(self.target))
+        mixer.music.load(self.stream)
+
+        try:
+            mixer.music.play(-1, start)
+        except pygame.error:
+            # the format doesn't support starting at a position
+            start = 0.0
+            mixer.music.play(-1)
+
+        self.current = self.target
+        self.started_at = start
+        self.level = 0.0
+
+    # moves the fades forward, called every frame
+    def update(self, dt):
+        if self.target is None:
+            return
+
+        if self.target != self.current:
+            if self.current is None or self.level <= 0.0:
+                self.switch()
+            else:
+                self.level = max(0.0, self.level - dt / self.fade_time)
+
+        elif self.level < 1.0:
+            self.level = min(1.0, self.level + dt / self.fade_time)
+
+        volume = self.volume * self.level
+        if volume != self.applied_volume:
+            mixer.music.set_volume(volume)
+            self.applied_volume = volume
+
+
+# the music of the whole game
+music = MusicManager()
+
+
+# Runs the music fades, every world that plays music needs it.
+@frame_io_guard
+class UpdateMusic(WorldScript):
+
+    def __init__(self):
+        super(UpdateMusic, self).__init__("update music")
+
+    def update(self):
+        music.update(self.world.engine.delta_time)
@@ -0,0 +1,115 @@
+
+# Offline tool that packs the frames of animation directories into one atlas image and writes the
+# index read by atlas.py. Run it again after adding or editing frames:
+#
+#   python pack_atlas.py [animation directories...]
+#
+# Identical frames are stored once, and frames are placed on shelves of similar height using
+# the shelf width that wastes the least space.
+
+import json
+import sys
+from os.path import basename, dirname, join
+
+import pygame
+
+from atlas import ATLAS_INDEX, atlas_key
+from utility import get_files_in_dir
+
+# directories packed when none are given
+ANIMATION_DIRS = ["assets/animations/Idle/",
+                  "assets/animations/Walking/",
+                  "assets/animations/Jumping/",
+                  "assets/animations/Climbing/"]
+
+MAX_ATLAS_WIDTH = 2048
+
+
+# Places the sizes on shelves no wider than max_width, tallest first.
+# Returns the position of every size and the size of the whole atlas.
+def shelf_pack(sizes, max_width):
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+
+    x = 0
+    y = 0
+    shelf_h = 0
+    width = 0
+
+    for i in order:
+        w, h = sizes[i]
+
+        if x + w > max_width and x > 0:
+            y += shelf_h
+            x = 0
+            shelf_h = 0
+
+        positions[i] = (x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+        width = max(width, x)
+
+    return positions, (width, y + shelf_h)
+
+
+# Tries shelf widths up to max_width and keeps the packing with the smallest area, the squarest
+# one when several waste the same space.
+def smallest_pack(sizes, max_width):
+    widest = max(w for w, h in sizes)
+    step = min(w for w, h in sizes)
+
+    best = None
+    for width in range(widest, max_width + 1, step):
+        positions, size = shelf_pack(sizes, width)
+        score = (size[0] * size[1], max(size))
+        if best is None or score < best[0]:
+            best = (score, positions, size)
+
+    return best[1], best[2]
+
+
+def pack(dir_paths, index_path=ATLAS_INDEX, max_width=MAX_ATLAS_WIDTH):
+    images = list()
+    frame_ids = dict()
+    animations = dict()
+
+    # load every frame, keeping one copy of the identical ones
+    for dir_path in dir_paths:
+        ids = list()
+        for path in get_files_in_dir(dir_path):
+            image = pygame.image.load(path)
+            data = (image.get_size(), pygame.image.tostring(image, "RGBA"))
+
+            if data not in frame_ids:
+                frame_ids[data] = len(images)
+                images.append(image)
+
+            ids.append(frame_ids[data])
+
+        animations[atlas_key(dir_path)] = ids
+
+    positions, size = smallest_pack([image.get_size() for image in images], max_width)
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    for image, position in zip(images, positions):
+        atlas.blit(image, position, special_flags=pygame.BLEND_RGBA_ADD)
+
+    rects = [[x, y, image.get_width(), image.get_height()] for image, (x, y) in zip(images, positions)]
+
+    image_name = basename(index_path).rsplit(".", 1)[0] + ".png"
+    pygame.image.save(atlas, join(dirname(index_path), image_name))
+
+    index = {"image": image_name,
+             "animations": dict((key, [rects[i] for i in ids]) for key, ids in animations.items())}
+
+    with open(index_path, "w") as index_file:
+        json.dump(index, index_file, sort_keys=True)
+
+    frame_count = sum(len(ids) for ids in animations.values())
+    print("packed " + str(frame_count) + " frames (" + str(len(images)) + " unique) into " +
+          str(size[0]) + "x" + str(size[1]))
+
+
+if __name__ == "__main__":
+    pack(sys.argv[1:] or ANIMATION_DIRS)
@@ -0,0 +1,137 @@
+
+# Loads the images and sounds of the worlds ahead of time on a pool of worker threads, so that
+# building a world later only gets cache hits. The workers read and decode the files; converting
+# a surface to the display format has to happen on the main thread and is done by pump(), a
+# little at a time, from wherever the main thread is idle (such as the title screen).
+
+import logging
+import threading
+import time
+
+try:
+    from queue import Queue, Empty
+except ImportError:
+    from Queue import Queue, Empty
+
+import pygame
+from pygame import mixer
+
+from asset_cache import cache, CONVERT_ALPHA
+from sounds import add_sound, contains_sound
+
+DEFAULT_WORKERS = 4
+
+IMAGE = "image"
+SOUND = "sound"
+
+logger = logging.getLogger(__name__)
+
+
+class Preloader(object):
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.jobs = Queue()
+        self.results = Queue()
+
+        # number of files queued and number of files that are ready to use
+        self.total = 0
+        self.done = 0
+
+        self.failed = list()
+
+        self.workers = list()
+        for i in range(workers):
+            worker = threading.Thread(target=self.work, name="preloader " + str(i))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+    # Queues images given the same way as a world's asset_manifest. Images that are already in
+    # the cache are skipped.
+    def add_images(self, items):
+        queued = set()
+        for item in items:
+            if not isinstance(item, tuple):
+                item = (item,)
+
+            path = item[0]
+            mode = item[1] if len(item) > 1 else CONVERT_ALPHA
+
+            if (path, mode) in queued or cache.contains(path, mode):
+                continue
+
+            queued.add((path, mode))
+            self.total += 1
+            self.jobs.put((IMAGE, (path, mode)))
+
+    def add_sounds(self, paths):
+        for path in set(paths):
+            if contains_sound(path):
+                continue
+
+            self.total += 1
+            self.jobs.put((SOUND, path))
+
+    # loop of the worker threads, None stops it
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+
+            kind, item = job
+            try:
+                if kind == IMAGE:
+                    result = pygame.image.load(item[0])
+                else:
+                    result = mixer.Sound(item)
+
+                self.results.put((kind, item, result))
+
+            except Exception as error:
+                self.results.put((kind, item, error))
+
+    def finish_job(self, kind, item, result):
+        self.done += 1
+
+        if isinstance(result, Exception):
+            # the regular loading path will report the error if the file is ever used
+            logger.warning("could not preload " + str(item) + ": " + str(result))
+            self.failed.append(item)
+
+        elif kind == IMAGE:
+            cache.add_decoded(item[0], item[1], result)
+
+        else:
+            add_sound(item, result)
+
+    # Finishes the loaded files for up to budget seconds on the calling thread, which must be the
+    # main thread. Returns the progress.
+    def pump(self, budget=0.005):
+        deadline = time.time() + budget
+
+        while time.time() < deadline:
+            try:
+                kind, item, result = self.results.get_nowait()
+            except Empty:
+                break
+
+            self.finish_job(kind, item, result)
+
+        return self.progress()
+
+    # Blocks until every queued file is ready and stops the workers.
+    def finish(self):
+        while self.done < self.total:
+            self.finish_job(*self.results.get())
+
+        for worker in self.workers:
+            self.jobs.put(None)
+
+    def progress(self):
+        if self.total == 0:
+            return 1.0
+        return self.done / float(self.total)
+
+    def finished(self):
+        return self.done >= self.total
@@ -0,0 +1,39 @@
+
+# Restarting the game puts every world back the way it was after it was loaded (see snapshot).
+# Writing a snapshot back replaces the script and entity lists of a world in place, which must
+# not happen while the engine is going through them. So the game doesn't restore the worlds from
+# the callback that asks for the restart; it switches to this empty world instead, and the script
+# of this world restores the others on its update, when none of them is being updated.
+
+from world import World
+from components import WorldScript
+from asset_cache import frame_io_guard
+
+
+@frame_io_guard
+class ResetWorlds(WorldScript):
+
+    def __init__(self):
+        super(ResetWorlds, self).__init__("reset worlds")
+
+    def update(self):
+        game = self.world.engine.game
+        if game.restart_pending:
+            game.reset_worlds()
+
+
+class RestartWorld(World):
+
+    def __init__(self):
+        super(RestartWorld, self).__init__()
+
+        self.reset_worlds = None
+
+    def resume(self):
+        pass
+
+    # the world is shown for a frame on every restart, only add the script once
+    def load_scene(self):
+        if self.reset_worlds is None:
+            self.reset_worlds = ResetWorlds()
+            self.add_script(self.reset_worlds)
@@ -4,8 +4,13 @@ from components import BehaviorScript
 from util_math import Vector2
 
 from systems import PhysicsSystem
+from asset_cache import frame_io_guard
+from collision_routing import CollisionRouter, LADDER, GROUND
+from entity_index import ScriptHandle
+from fixed_step import FixedStepMover
 
 
+@frame_io_guard
 class CameraFollow(BehaviorScript):
 
     def __init__(self, script_name, target_transform, cam_width, cam_height):
@@ -40,7 +45,8 @@ class CameraFollow(BehaviorScript):
         self.entity.transform.position = Vector2(x, y)
 
 
-class ElevatorPlatMovement(BehaviorScript):
+@frame_io_guard
+class ElevatorPlatMovement(FixedStepMover, CollisionRouter):
 
     def __init__(self, spawn_point, script_name):
         super(ElevatorPlatMovement, self).__init__(script_name)
@@ -48,17 +54,16 @@ class ElevatorPlatMovement(BehaviorScript):
         self.velocity = Vector2(0, -100)
         self.spawn_point = spawn_point
 
-    def update(self):
-        dt = self.entity.world.engine.delta_time
-        transform = self.entity.transform
-        transform.position += self.velocity * dt
+        self.mask = GROUND
+        self.on_tag("ceiling", self.hit_ceiling)
 
-    def collision_event(self, other_collider):
+    def fixed_update(self, dt):
+        self.position += self.velocity * dt
 
-        # reset to the bottom
-        if other_collider.entity.tag == "ceiling":
-            self.entity.transform.position.x = self.spawn_point.x
-            self.entity.transform.position.y = self.spawn_point.y
+    # reset to the bottom
+    def hit_ceiling(self, other_collider):
+        self.entity.transform.position.x = self.spawn_point.x
+        self.entity.transform.position.y = self.spawn_point.y
 
 
 # # add movement to a platform but have it ignore physical properties
@@ -105,6 +110,7 @@ class ElevatorPlatMovement(BehaviorScript):
 
 
 # This script defines the behavior of how the player moves in a 2d side scroller world
+@frame_io_guard
 class PlayerPlatformMovement(BehaviorScript):
 
     def __init__(self, script_name):
@@ -116,6 +122,8 @@ class PlayerPlatformMovement(BehaviorScript):
         self.grounded = False
         self.holding_crate = False
 
+        self.climb = ScriptHandle("player climb")
+
     def update(self):
         keys = pygame.key.get_pressed()
 
@@ -159,7 +167,7 @@ class PlayerPlatformMovement(BehaviorScript):
                     crate = result[1]
                     crate.rigid_body.velocity.x = self.entity.rigid_body.velocity.x
 
-        if self.entity.get_script("player climb").climbing:
+        if self.climb.get(self.entity).climbing:
 
             if keys[pygame.K_a]:
                 self.moving = True
@@ -215,18 +223,12 @@ class PlayerPlatformMovement(BehaviorScript):
 
         self.grounded = False
 
-        # iterate through object considered as ground
-        for other in self.entity.world.ground:
-
-            player = self.entity
-
-            # if the player collided with an element considered as ground, then ground the player
-            if PhysicsSystem.tolerance_collision(player.collider, other.collider):
+        world = self.entity.world
 
-                # check orientation of the collision
-                orientation = PhysicsSystem.calc_box_hit_orientation
-                if orientation(player.collider, other.collider) == PhysicsSystem.bottom:
-                    self.grounded = True
+        # if the player is touching an element considered as ground from its bottom side, then ground the player
+        for other, side in world.contacts.contacts(self.entity.collider):
+            if side == PhysicsSystem.bottom and world.is_ground(other.entity):
+                self.grounded = True
 
     def check_if_near_crate(self):
 
@@ -235,20 +237,19 @@ class PlayerPlatformMovement(BehaviorScript):
         # check if the player is near a box
         for crate in self.entity.world.crates:
 
-            # this code stops crates from being pushed inside of colliders such as walls
-            for entity in self.entity.world.entity_manager.entities:
-
-                # collider exists and is not a trigger
-                valid_collider = entity.collider is not None and not entity.collider.is_trigger
+            # this code stops crates from being pushed inside of colliders such as walls,
+            # only the colliders around the crate (with a pixel of slack for boxes that just touch it) are tested
+            for collider in self.entity.world.broadphase.query_near(crate.collider, 1):
+                entity = collider.entity
 
-                # don't consider the player or yourself during this collision test
-                if valid_collider and entity is not self.entity and entity is not crate:
+                # don't consider triggers or the player during this collision test
+                if not collider.is_trigger and entity is not self.entity:
 
                     # collision occurs
-                    if PhysicsSystem.box2box_collision(crate.collider, entity.collider):
+                    if PhysicsSystem.box2box_collision(crate.collider, collider):
 
                         # check of the collision occurred from the sides
-                        side = PhysicsSystem.calc_box_hit_orientation(crate.collider, entity.collider)
+                        side = PhysicsSystem.calc_box_hit_orientation(crate.collider, collider)
                         if side == PhysicsSystem.left or side == PhysicsSystem.right:
 
                             # stop the crate from moving
@@ -285,16 +286,20 @@ class PlayerPlatformMovement(BehaviorScript):
         return result
 
 
-class PlayerClimbing(BehaviorScript):
+@frame_io_guard
+class PlayerClimbing(CollisionRouter):
 
     def __init__(self, script_name):
-        super(PlayerClimbing, self).__init__(script_name)
+        super(PlayerClimbing, self).__init__(script_name, LADDER)
 
         self.climb_speed = 200.0
         self.move_up = False
         self.move_down = False
         self.climbing = False
 
+        self.plat_move = ScriptHandle("player plat move")
+        self.on_category(LADDER, self.touch_ladder)
+
     def update(self):
         keys = pygame.key.get_pressed()
 
@@ -343,34 +348,30 @@ class PlayerClimbing(BehaviorScript):
             self.entity.rigid_body.gravity_scale = 1.0
             self.entity.animator.pause = False
 
-    def collision_event(self, other_collider):
+    # the player is colliding with a ladder
+    def touch_ladder(self, other_collider):
+        plat_move = self.plat_move.get(self.entity)
+        grounded = plat_move.grounded
 
-        # if the player is colliding with the ladder
-        if other_collider.entity.tag == "ladder":
-            grounded = self.entity.get_script("player plat move").grounded
+        # if the player wants to move up or down then set climbing to true
+        # and un-ground the player
+        if self.move_up:
 
-            # if the player wants to move up or down then set climbing to true
-            # and un-ground the player
-            if self.move_up:
-
-                # if the player climbs the ladder from mid air then slow him down
-                # to attach him to the ladder
-                if not grounded:
-                    self.entity.rigid_body.velocity.x *= 0.1
+            # if the player climbs the ladder from mid air then slow him down
+            # to attach him to the ladder
+            if not grounded:
+                self.entity.rigid_body.velocity.x *= 0.1
 
-                self.entity.get_script("player plat move").grounded = False
-                self.climbing = True
+            plat_move.grounded = False
+            self.climbing = True
 
-            elif self.move_down:
-                if not grounded:
-                    self.entity.rigid_body.velocity.x *= 0.1
+        elif self.move_down:
+            if not grounded:
+                self.entity.rigid_body.velocity.x *= 0.1
 
-                self.entity.get_script("player plat move").grounded = False
-                self.climbing = True
+            plat_move.grounded = False
+            self.climbing = True
 
     def colliding_with_ladder(self):
         # check if the player is colliding with a ladder
-        for ladder in self.entity.world.ladders:
-            if PhysicsSystem.tolerance_collision(self.entity.collider, ladder.collider):
-                return True
-        return False
\ No newline at end of file
+        return self.entity.world.contacts.touching(self.entity.collider, LADDER)
\ No newline at end of file
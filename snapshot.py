@@ -0,0 +1,139 @@
+
+# Snapshots of the state of a world, so that restarting the game puts the existing worlds back
+# the way they were right after load_scene instead of building new ones.
+#
+# A snapshot is taken by walking every object reachable from the world (entities, components,
+# scripts, systems, lists and dicts) and copying their attributes and contents. Restoring writes
+# those copies back into the same objects, so references held anywhere stay valid. Surfaces,
+# sounds and other objects without attributes are shared and not copied; they are never drawn
+# onto by the game except for buffers that are redrawn every frame anyway.
+
+import inspect
+from functools import wraps
+from types import FunctionType, MethodType, BuiltinFunctionType, ModuleType
+
+from pygame import Rect
+
+# objects that are never walked into
+_opaque_types = (FunctionType, MethodType, BuiltinFunctionType, ModuleType)
+
+# the snapshot of every world taken after its first load_scene, by id of the world
+_initial_states = dict()
+
+
+def slot_names(obj):
+    names = list()
+    for cls in type(obj).__mro__:
+        slots = vars(cls).get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in ("__dict__", "__weakref__"))
+    return names
+
+
+class Snapshot(object):
+
+    # skip holds objects that are referenced but not part of the state, such as the engine
+    def __init__(self, root, skip=()):
+        skip_ids = set(id(obj) for obj in skip)
+
+        # (object, copy of its state) by id of the object
+        self.states = dict()
+
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+
+            if id(obj) in self.states or id(obj) in skip_ids:
+                continue
+
+            if isinstance(obj, _opaque_types) or inspect.isclass(obj):
+                continue
+
+            if isinstance(obj, Rect):
+                self.states[id(obj)] = (obj, tuple(obj))
+                continue
+
+            if isinstance(obj, list):
+                state = list(obj)
+                children = state
+
+            elif isinstance(obj, dict):
+                state = dict(obj)
+                children = list(state.keys()) + list(state.values())
+
+            elif isinstance(obj, set):
+                state = set(obj)
+                children = list(state)
+
+            elif isinstance(obj, tuple):
+                # immutable, but the objects inside of it may not be
+                stack.extend(obj)
+                continue
+
+            elif hasattr(obj, "__dict__") or slot_names(obj):
+                state = (dict(vars(obj)) if hasattr(obj, "__dict__") else dict(),
+                         dict((name, getattr(obj, name)) for name in slot_names(obj) if hasattr(obj, name)))
+                children = list(state[0].values()) + list(state[1].values())
+
+            else:
+                continue
+
+            self.states[id(obj)] = (obj, state)
+            stack.extend(children)
+
+    def restore(self):
+        for obj, state in self.states.values():
+
+            if isinstance(obj, Rect):
+                obj.x, obj.y, obj.w, obj.h = state
+
+            elif isinstance(obj, list):
+                obj[:] = state
+
+            elif isinstance(obj, dict):
+                obj.clear()
+                obj.update(state)
+
+            elif isinstance(obj, set):
+                obj.clear()
+                obj.update(state)
+
+            else:
+                attributes, slots = state
+                if hasattr(obj, "__dict__"):
+                    vars(obj).clear()
+                    vars(obj).update(attributes)
+                for name, value in slots.items():
+                    setattr(obj, name, value)
+
+
+def capture_initial_state(world):
+    _initial_states[id(world)] = (world, Snapshot(world, skip=(getattr(world, "engine", None),)))
+
+
+# Puts the world back in the state it had after its first load_scene. Worlds that were never
+# loaded are left as they are. Don't call this while the engine is going through the entities
+# of the world, such as from a script callback.
+def restore_initial_state(world):
+    entry = _initial_states.get(id(world))
+    if entry is not None:
+        entry[1].restore()
+
+
+# Decorator for World.load_scene. The state of the world is captured once the scene is built.
+# If the scene is asked to load again, the world is restored instead of adding a second copy
+# of every entity.
+def captures_initial_state(load_scene):
+
+    @wraps(load_scene)
+    def load_scene_and_capture(world):
+        if id(world) in _initial_states:
+            restore_initial_state(world)
+            return
+
+        result = load_scene(world)
+        capture_initial_state(world)
+        return result
+
+    return load_scene_and_capture
@@ -0,0 +1,172 @@
+
+# Sound effects shared by the whole game. A sound file is decoded once no matter how many worlds
+# or scripts use it, and is loaded on first use instead of when the world modules are imported.
+#
+# Sounds are played on a fixed pool of mixer channels. Each sound can have a cooldown and a limit
+# on how many copies of it play at once, so effects triggered every frame of a contact don't
+# flood the mixer. When every channel is busy, the lowest priority, oldest voice is cut off.
+
+import time
+from os.path import normpath
+
+from pygame import mixer
+
+from asset_cache import check_frame_io
+
+DEFAULT_CHANNELS = 8
+
+
+class SoundSettings(object):
+
+    # volume: volume of the channel the sound plays on, the sound itself is shared
+    # cooldown: seconds before the sound can play again
+    # max_voices: copies of the sound that can play at once, None for no limit
+    # priority: voices with a lower priority are stolen first
+    def __init__(self, volume=1.0, cooldown=0.0, max_voices=None, priority=0):
+        self.volume = volume
+        self.cooldown = cooldown
+        self.max_voices = max_voices
+        self.priority = priority
+
+
+class SoundBank(object):
+
+    def __init__(self, channels=DEFAULT_CHANNELS):
+
+        # decoded sounds and their settings, by path
+        self.sounds = dict()
+        self.settings = dict()
+
+        # when each sound was last played
+        self.last_played = dict()
+
+        # the channel pool, created on the first play since it needs the mixer
+        self.channel_count = channels
+        self.channels = None
+
+        # (path, start time, priority) of the voice on each channel
+        self.voices = list()
+
+        self.played = 0
+        self.throttled = 0
+        self.stolen = 0
+
+    def load(self, path):
+        key = normpath(path)
+
+        sound = self.sounds.get(key)
+        if sound is None:
+            check_frame_io(path, "sound decoded")
+            sound = mixer.Sound(path)
+            self.sounds[key] = sound
+
+        return sound
+
+    def contains(self, path):
+        return normpath(path) in self.sounds
+
+    # adds a sound that was loaded somewhere else, such as on a loader thread
+    def add(self, path, sound):
+        self.sounds.setdefault(normpath(path), sound)
+
+    def configure(self, path, volume=1.0, cooldown=0.0, max_voices=None, priority=0):
+        self.load(path)
+        self.settings[normpath(path)] = SoundSettings(volume, cooldown, max_voices, priority)
+
+    def create_channels(self):
+        if mixer.get_num_channels() < self.channel_count:
+            mixer.set_num_channels(self.channel_count)
+
+        self.channels = [mixer.Channel(i) for i in range(self.channel_count)]
+        self.voices = [None] * self.channel_count
+
+    # Plays the sound unless it is cooling down or already playing as many times as it may.
+    # Returns the channel it plays on, or None.
+    def play(self, path):
+        if self.channels is None:
+            self.create_channels()
+
+        key = normpath(path)
+        sound = self.load(path)
+        settings = self.settings.get(key) or SoundSettings()
+        now = time.time()
+
+        last = self.last_played.get(key)
+        if last is not None and now - last < settings.cooldown:
+            self.throttled += 1
+            return None
+
+        # forget the voices that finished
+        for i, channel in enumerate(self.channels):
+            if self.voices[i] is not None and not channel.get_busy():
+                self.voices[i] = None
+
+        if settings.max_voices is not None:
+            playing = sum(1 for voice in self.voices if voice is not None and voice[0] == key)
+            if playing >= settings.max_voices:
+                self.throttled += 1
+                return None
+
+        index = self.free_channel()
+        if index is None:
+            index = self.steal_channel(settings.priority)
+            if index is None:
+                self.throttled += 1
+                return None
+
+        # the channels are reused, so the volume is set on every play
+        channel = self.channels[index]
+        channel.play(sound)
+        channel.set_volume(settings.volume)
+
+        self.voices[index] = (key, now, settings.priority)
+        self.last_played[key] = now
+        self.played += 1
+        return channel
+
+    def free_channel(self):
+        for i, voice in enumerate(self.voices):
+            if voice is None:
+                return i
+        return None
+
+    # stops the lowest priority, oldest voice that doesn't outrank the new one
+    def steal_channel(self, priority):
+        candidates = [(voice[2], voice[1], i) for i, voice in enumerate(self.voices) if voice[2] <= priority]
+        if not candidates:
+            return None
+
+        index = min(candidates)[2]
+        self.channels[index].stop()
+        self.stolen += 1
+        return index
+
+    def stats(self):
+        return {"sounds": len(self.sounds),
+                "played": self.played,
+                "throttled": self.throttled,
+                "stolen": self.stolen}
+
+
+# the sound bank shared by the whole game
+bank = SoundBank()
+
+
+def load_sound(path):
+    return bank.load(path)
+
+
+def play_sound(path):
+    return bank.play(path)
+
+
+def configure_sound(path, volume=1.0, cooldown=0.0, max_voices=None, priority=0):
+    bank.configure(path, volume, cooldown, max_voices, priority)
+
+
+def contains_sound(path):
+    return bank.contains(path)
+
+
+def add_sound(path, sound):
+    bank.add(path, sound)
@@ -0,0 +1,103 @@
+
+# Sprite sheets generated from a single image, such as the frames of a spinning saw. Building
+# them means a lot of transform calls, so the sheet is saved to disk the first time and later
+# runs (and restarts of the game) only load it back.
+
+import hashlib
+import logging
+from os import makedirs
+from os.path import join, isdir, isfile, normpath
+
+import pygame
+
+from asset_cache import load_image
+from utility import blit_all
+
+# where generated sheets are stored, ignored by git
+CACHE_DIR = "cache/sprite_sheets"
+
+logger = logging.getLogger(__name__)
+
+# sheets already loaded in this process, by (path, frame count, scale)
+_sheets = dict()
+
+
+# hash of the contents of the file, so that editing the image invalidates its sheets
+def file_hash(path):
+    with open(path, "rb") as image_file:
+        return hashlib.sha1(image_file.read()).hexdigest()
+
+
+# Splits a horizontal strip into frames of the given width, as subsurfaces of the strip.
+def split_strip(strip, frame_w):
+    frame_h = strip.get_height()
+    return [strip.subsurface((x, 0, frame_w, frame_h)) for x in range(0, strip.get_width(), frame_w)]
+
+
+# Rotates the image by 360 / count degrees steps. Each frame keeps the size of the original and
+# is cut around the center of the rotated image, the same way load_saw used to do it.
+def build_rotation_strip(image, count):
+    original_rect = image.get_rect()
+
+    strip = pygame.Surface((original_rect.w * count, original_rect.h), pygame.SRCALPHA, 32).convert_alpha()
+    strip.fill((0, 0, 0, 0))
+
+    blits = list()
+    for i in range(count):
+        rotated_surface = pygame.transform.rotate(image, i * 360.0 / count)
+
+        # adjust new surface's center with the original's
+        rotate_rect = original_rect.copy()
+        rotate_rect.center = rotated_surface.get_rect().center
+
+        blits.append((rotated_surface.subsurface(rotate_rect), (i * original_rect.w, 0)))
+
+    blit_all(strip, blits)
+    return strip
+
+
+def save_strip(strip, cache_path):
+    try:
+        if not isdir(CACHE_DIR):
+            makedirs(CACHE_DIR)
+        pygame.image.save(strip, cache_path)
+
+    # not being able to write the cache only costs a rebuild on the next run
+    except (pygame.error, IOError, OSError) as error:
+        logger.warning("could not save sprite sheet " + cache_path + ": " + str(error))
+
+
+# Returns count frames of the image at the path rotated around its center, starting at 0 degrees
+# and going counter clockwise. scale is the scale the image is shown at; image can be the image
+# already scaled that way (such as the sprite of an entity scaled with scale_by), otherwise the
+# file is scaled here.
+def rotation_frames(path, count, scale=1.0, image=None):
+    path = normpath(path)
+    key = (path, count, scale)
+
+    if key in _sheets:
+        return _sheets[key]
+
+    if image is None:
+        image = load_image(path)
+        if scale != 1.0:
+            size = (int(image.get_width() * scale), int(image.get_height() * scale))
+            image = pygame.transform.scale(image, size)
+
+    cache_path = join(CACHE_DIR, "rotation_" + file_hash(path) + "_" + str(count) + "_" + str(scale) + ".png")
+
+    strip = None
+    if isfile(cache_path):
+        strip = pygame.image.load(cache_path).convert_alpha()
+
+        # the image changed size without changing contents, which should not happen, but rebuild
+        if strip.get_size() != (image.get_width() * count, image.get_height()):
+            strip = None
+
+    if strip is None:
+        strip = build_rotation_strip(image, count)
+        save_strip(strip, cache_path)
+
+    frames = split_strip(strip, image.get_width())
+    _sheets[key] = frames
+    return frames
@@ -0,0 +1,71 @@
+
+# Timings of the phases of starting the game (imports, display init, image decoding, scene
+# loading), so that changes to the startup can be measured. Enable the report by setting the
+# LUMINESCENCE_STARTUP_REPORT environment variable.
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# importing this module first marks the start of the process
+PROCESS_START = time.time()
+
+
+class StartupTimer(object):
+
+    def __init__(self):
+
+        # (phase name, seconds) in the order they finished
+        self.phases = list()
+
+        # phases still to be recorded before on_recorded is called, see when_recorded
+        self.awaited = set()
+        self.on_recorded = None
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+        logger.info("%s: %.3fs", name, seconds)
+
+        self.awaited.discard(name)
+        if not self.awaited and self.on_recorded is not None:
+            callback = self.on_recorded
+            self.on_recorded = None
+            callback()
+
+    # calls the callback once, when every one of the phases has been recorded
+    def when_recorded(self, names, callback):
+        self.awaited = set(names) - set(name for name, seconds in self.phases)
+        self.on_recorded = callback
+        if not self.awaited:
+            self.on_recorded = None
+            callback()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record(name, time.time() - start)
+
+    # time since the process started, as a phase
+    def record_since_start(self, name):
+        self.record(name, time.time() - PROCESS_START)
+
+    def report(self):
+        lines = ["startup:"]
+        for name, seconds in self.phases:
+            lines.append("  %-28s %8.3fs" % (name, seconds))
+        lines.append("  %-28s %8.3fs" % ("since process start", time.time() - PROCESS_START))
+        return "\n".join(lines)
+
+
+# the timer shared by the whole game
+timer = StartupTimer()
+
+
+# the name of the phase of loading the world's scene
+def load_scene_phase(world):
+    return "load_scene " + type(world).__name__
@@ -0,0 +1,43 @@
+
+# Helpers to bake geometry that never moves. The tiles of the solid cells are drawn once into a
+# handful of chunk surfaces that are rendered like a background instead of one entity per tile;
+# the cells themselves are merged for collision by cell_rects.merge_cells.
+
+from pygame import Surface
+
+from utility import blit_all
+
+# color used as the transparent background of the chunks
+CHUNK_COLOR_KEY = (7, 13, 17)
+
+
+# Draws the tile at every cell into chunk surfaces of chunk_cols x chunk_rows cells. Cells are
+# centered at (column * cell_w, row * cell_h). Returns a list of (surface, (left, top)) with the
+# world position of the top left corner of each chunk; chunks without any cell are skipped.
+def bake_tile_chunks(cells, tile, cell_w, cell_h, chunk_cols=8, chunk_rows=5):
+
+    # group the cells by the chunk they fall into
+    chunks = dict()
+    for col, row in set(cells):
+        key = (col // chunk_cols, row // chunk_rows)
+        chunks.setdefault(key, list()).append((col, row))
+
+    size = (chunk_cols * cell_w, chunk_rows * cell_h)
+
+    baked = list()
+    for (chunk_x, chunk_y), chunk_cells in sorted(chunks.items()):
+        surface = Surface(size).convert()
+        surface.fill(CHUNK_COLOR_KEY)
+        surface.set_colorkey(CHUNK_COLOR_KEY)
+
+        first_col = chunk_x * chunk_cols
+        first_row = chunk_y * chunk_rows
+
+        blits = [(tile, ((col - first_col) * cell_w, (row - first_row) * cell_h)) for col, row in chunk_cells]
+        blit_all(surface, blits)
+
+        left = first_col * cell_w - cell_w / 2
+        top = first_row * cell_h - cell_h / 2
+        baked.append((surface, (left, top)))
+
+    return baked
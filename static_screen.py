@@ -0,0 +1,134 @@
+
+# A full screen image shown until a key is pressed, such as the title and end screens.
+# Instead of redrawing as fast as possible, it sleeps in pygame.event.wait and only draws again
+# when the window needs it, updating just the area of the image.
+
+import logging
+import os
+import time
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+# event used to wake up the screen while it has background work to check on
+TICK_EVENT = pygame.USEREVENT + 7
+
+# size and distance from the bottom of the display of the progress bar
+PROGRESS_BAR_SIZE = (300, 6)
+PROGRESS_BAR_MARGIN = 40
+
+# events after which the window contents may have to be drawn again
+REDRAW_EVENTS = set(getattr(pygame, name) for name in ("VIDEOEXPOSE", "ACTIVEEVENT", "WINDOWEVENT")
+                    if hasattr(pygame, name))
+
+
+class StaticScreen(object):
+
+    # on_quit is called when the window is closed. on_tick, if given, is called every tick_ms while
+    # the screen is up and returns the progress of some background work from 0 to 1, which is
+    # shown as a bar. Once it reaches 1 the screen goes back to only waiting for events.
+    def __init__(self, image, exit_keys=(pygame.K_RETURN,), background=(0, 0, 0), on_quit=None,
+                 on_tick=None, tick_ms=30):
+        self.image = image
+        self.exit_keys = exit_keys
+        self.background = background
+        self.on_quit = on_quit
+        self.on_tick = on_tick
+        self.tick_ms = tick_ms
+
+        # time and cpu time spent in the last show, see report
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.redraws = 0
+
+    # draws the image, and the background around it the first time
+    def draw(self, screen, position, full):
+        if full:
+            screen.fill(self.background)
+
+        rect = screen.blit(self.image, position)
+
+        if full:
+            pygame.display.update()
+        else:
+            pygame.display.update(rect)
+
+        self.redraws += 1
+
+    # Shows the image centered on the display and returns once an exit key is pressed.
+    def show(self):
+        screen = pygame.display.get_surface()
+
+        x = screen.get_width()/2 - self.image.get_width()/2
+        y = screen.get_height()/2 - self.image.get_height()/2
+
+        start_wall = time.time()
+        start_cpu = os.times()
+        self.redraws = 0
+
+        self.draw(screen, (x, y), True)
+
+        # events left over from before the screen was shown, such as the key that led here
+        pygame.event.clear()
+
+        ticking = self.on_tick is not None
+        if ticking:
+            pygame.time.set_timer(TICK_EVENT, self.tick_ms)
+
+        done = False
+        while not done:
+            event = pygame.event.wait()
+
+            if event.type == pygame.QUIT:
+                if self.on_quit is not None:
+                    self.on_quit()
+                done = True
+
+            elif event.type == pygame.KEYDOWN and event.key in self.exit_keys:
+                done = True
+
+            elif event.type in REDRAW_EVENTS:
+                self.draw(screen, (x, y), False)
+
+            elif event.type == TICK_EVENT and ticking:
+                progress = self.on_tick()
+                self.draw_progress(screen, progress)
+
+                if progress >= 1.0:
+                    pygame.time.set_timer(TICK_EVENT, 0)
+                    ticking = False
+
+        if ticking:
+            pygame.time.set_timer(TICK_EVENT, 0)
+
+        end_cpu = os.times()
+        self.wall_time = time.time() - start_wall
+        self.cpu_time = (end_cpu[0] - start_cpu[0]) + (end_cpu[1] - start_cpu[1])
+
+        logger.info(self.report())
+
+    # the bar is drawn below the image, and removed once the progress is complete
+    def draw_progress(self, screen, progress):
+        w, h = PROGRESS_BAR_SIZE
+        rect = pygame.Rect(screen.get_width()/2 - w/2, screen.get_height() - PROGRESS_BAR_MARGIN, w, h)
+
+        screen.fill(self.background, rect)
+
+        if progress < 1.0:
+            filled = rect.copy()
+            filled.w = int(w * progress)
+            pygame.draw.rect(screen, (90, 90, 90), rect, 1)
+            screen.fill((200, 200, 200), filled)
+
+        pygame.display.update(rect)
+
+    # how busy the process was while the screen was up
+    def cpu_usage(self):
+        if self.wall_time <= 0:
+            return 0.0
+        return self.cpu_time / self.wall_time
+
+    def report(self):
+        return ("static screen shown for %.2fs, cpu %.3fs (%.1f%%), %d redraws"
+                % (self.wall_time, self.cpu_time, self.cpu_usage() * 100.0, self.redraws))
@@ -0,0 +1,70 @@
+
+# The game's modules live at the root of the repository, next to main.py. The engine they run on
+# isn't part of the repository; when it isn't installed, the few engine classes the tested modules
+# build on are replaced with plain stand-ins that keep their scripts and entities in lists.
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class BehaviorScript(object):
+
+    def __init__(self, script_name):
+        self.script_name = script_name
+        self.entity = None
+
+
+class WorldScript(BehaviorScript):
+
+    def __init__(self, script_name):
+        super(WorldScript, self).__init__(script_name)
+        self.world = None
+
+
+class EntityManager(object):
+
+    def __init__(self):
+        self.entities = list()
+
+
+class World(object):
+
+    def __init__(self):
+        self.engine = None
+        self.scripts = list()
+        self.entity_manager = EntityManager()
+
+    def add_script(self, script):
+        script.world = self
+        self.scripts.append(script)
+
+
+class Vector2(object):
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x = x
+        self.y = y
+
+
+class Component(object):
+    pass
+
+
+def stand_in(name, **attributes):
+    module = types.ModuleType(name)
+    vars(module).update(attributes)
+    sys.modules[name] = module
+
+
+try:
+    import components
+except ImportError:
+    stand_in("components", BehaviorScript=BehaviorScript, WorldScript=WorldScript, Animator=Component,
+             RigidBody=Component, BoxCollider=Component, Transform=Component, Renderer=Component)
+    stand_in("world", World=World)
+    stand_in("util_math", Vector2=Vector2)
+    stand_in("systems", RenderSystem=type("RenderSystem", (object,), {"tag": "render"}),
+             PhysicsSystem=type("PhysicsSystem", (object,), {"tag": "physics"}))
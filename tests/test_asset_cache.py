@@ -0,0 +1,68 @@
+import logging
+
+import pygame
+
+import asset_cache
+from asset_cache import AssetCache, frame_io_guard, surface_bytes
+
+
+def surface():
+    return pygame.Surface((10, 10), 0, 32)
+
+
+def test_least_recently_used_are_evicted():
+    size = surface_bytes(surface())
+    cache = AssetCache(max_bytes=3 * size)
+
+    for name in "abcd":
+        cache.insert(name, surface())
+
+    assert list(cache.entries) == ["b", "c", "d"]
+    assert cache.evictions == 1
+    assert cache.size == 3 * size
+
+
+def test_pinned_entries_are_kept_and_count_towards_the_budget():
+    size = surface_bytes(surface())
+    cache = AssetCache(max_bytes=3 * size)
+
+    cache.insert("pinned", surface())
+    cache.pin("pinned")
+    for name in "abc":
+        cache.insert(name, surface())
+
+    assert "pinned" in cache.pinned
+    assert list(cache.entries) == ["b", "c"]
+    assert cache.stats()["bytes"] == 3 * size
+
+
+def test_pinning_over_the_budget_warns_once(caplog):
+    size = surface_bytes(surface())
+    cache = AssetCache(max_bytes=size)
+
+    with caplog.at_level(logging.WARNING, logger="asset_cache"):
+        for name in "abc":
+            cache.insert(name, surface())
+            cache.pin(name)
+
+    assert len(caplog.records) == 1
+    assert len(cache.pinned) == 3
+
+
+def test_inherited_callbacks_are_guarded(monkeypatch):
+    monkeypatch.setattr(asset_cache, "IO_DEBUG", "log")
+    depths = list()
+
+    class Base(object):
+        def update(self):
+            depths.append(asset_cache.cache.callback_depth)
+
+    @frame_io_guard
+    class Script(Base):
+        pass
+
+    Script().update()
+
+    assert depths == [1]
+    # the base class itself is left as it was
+    assert not getattr(vars(Base)["update"], "frame_io_guarded", False)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+from pygame import Rect
+
+from broadphase import Broadphase
+from collision_routing import set_collision_category, collides, PLAYER, GROUND, CRATE, LADDER, LIGHT
+
+
+def add_entity(world, tag, rect, category):
+    entity = SimpleNamespace(tag=tag, rigid_body=None)
+    entity.collider = SimpleNamespace(entity=entity, box=Rect(rect), treat_as_dynamic=False)
+    set_collision_category(entity.collider, category)
+
+    world.entity_manager.entities.append(entity)
+    return entity
+
+
+def make_world():
+    world = SimpleNamespace(entity_manager=SimpleNamespace(entities=list()))
+
+    add_entity(world, "wall", (0, 0, 50, 50), GROUND)
+    add_entity(world, "ladder", (40, 0, 20, 100), LADDER)
+    add_entity(world, "lamp light", (0, 40, 100, 100), LIGHT)
+
+    return world
+
+
+def test_masks_of_both_colliders_have_to_match():
+    world = make_world()
+    wall, ladder, light = world.entity_manager.entities
+    crate = add_entity(world, "box", (30, 30, 20, 20), CRATE)
+    player = add_entity(world, "player", (30, 30, 20, 20), PLAYER)
+
+    assert collides(crate.collider, wall.collider)
+    assert collides(player.collider, ladder.collider)
+    assert not collides(crate.collider, ladder.collider)
+    assert not collides(crate.collider, light.collider)
+    assert not collides(wall.collider, wall.collider)
+
+
+def test_query_near_drops_pairs_nobody_cares_about():
+    world = make_world()
+    crate = add_entity(world, "box", (30, 30, 20, 20), CRATE)
+
+    broadphase = Broadphase(world)
+    broadphase.build_static()
+
+    found = broadphase.query_near(crate.collider, 1)
+
+    assert [collider.entity.tag for collider in found] == ["wall"]
+    assert broadphase.stats()["masked pairs"] == 2
+
+
+def test_query_near_leaves_the_collider_out():
+    world = make_world()
+    player = add_entity(world, "player", (30, 30, 20, 20), PLAYER)
+    player.collider.treat_as_dynamic = True
+
+    broadphase = Broadphase(world)
+    broadphase.build_static()
+
+    found = broadphase.query_near(player.collider, 1)
+
+    assert sorted(collider.entity.tag for collider in found) == ["ladder", "lamp light", "wall"]
@@ -0,0 +1,41 @@
+from cell_rects import merge_cells
+
+
+def cells_of(rects):
+    cells = list()
+    for col, row, cols, rows in rects:
+        for r in range(row, row + rows):
+            for c in range(col, col + cols):
+                cells.append((c, r))
+    return cells
+
+
+def test_merge_cells_single_cell():
+    assert merge_cells([(3, -2)]) == [(3, -2, 1, 1)]
+
+
+def test_merge_cells_row_and_column():
+    assert merge_cells([(0, 0), (1, 0), (2, 0)]) == [(0, 0, 3, 1)]
+    assert merge_cells([(5, 1), (5, 2), (5, 3)]) == [(5, 1, 1, 3)]
+
+
+def test_merge_cells_block():
+    cells = [(c, r) for c in range(-1, 3) for r in range(2, 5)]
+    assert merge_cells(cells) == [(-1, 2, 4, 3)]
+
+
+def test_merge_cells_l_shape():
+    cells = [(0, 0), (1, 0), (2, 0), (0, 1), (0, 2)]
+    assert merge_cells(cells) == [(0, 0, 3, 1), (0, 1, 1, 2)]
+
+
+def test_merge_cells_covers_every_cell_once():
+    cells = [(0, 0), (1, 0), (3, 0), (1, 1), (2, 1), (3, 1), (0, 2), (1, 2), (1, 2)]
+
+    covered = cells_of(merge_cells(cells))
+
+    assert sorted(covered) == sorted(set(cells))
+
+
+def test_merge_cells_empty():
+    assert merge_cells([]) == []
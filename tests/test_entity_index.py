@@ -0,0 +1,136 @@
+import pytest
+
+import entity_index
+from entity_index import TagIndex, TagIndexError, ScriptHandle
+
+
+class Entity(object):
+    def __init__(self, tag):
+        self.tag = tag
+
+
+class EntityManager(object):
+    def __init__(self):
+        self.entities = list()
+
+
+class World(object):
+    def __init__(self, *tags):
+        self.entity_manager = EntityManager()
+        for tag in tags:
+            self.create_entity(tag)
+
+    def create_entity(self, tag):
+        entity = Entity(tag)
+        self.entity_manager.entities.append(entity)
+        return entity
+
+    def destroy_entity(self, entity):
+        self.entity_manager.entities.remove(entity)
+
+
+def test_lookup_by_tag():
+    world = World("floor", "box", "floor")
+    index = TagIndex(world)
+
+    floors = world.entity_manager.entities[0], world.entity_manager.entities[2]
+    assert tuple(index.entities("floor")) == floors
+    assert index.first("box") is world.entity_manager.entities[1]
+    assert index.first("cabin") is None
+
+
+def test_lookups_reuse_the_index():
+    world = World("floor", "box")
+    index = TagIndex(world)
+
+    index.first("floor")
+    index.first("box")
+    index.first("floor")
+
+    assert index.builds == 1
+
+
+def test_create_and_destroy_in_the_same_frame():
+    world = World("lamp light", "lamp light", "floor")
+    index = TagIndex(world)
+    old_lamp = index.first("lamp light")
+
+    world.destroy_entity(old_lamp)
+    index.remove(old_lamp)
+    new_lamp = world.create_entity("lamp light")
+    index.add(new_lamp)
+
+    lamps = index.entities("lamp light")
+    assert old_lamp not in lamps
+    assert new_lamp in lamps
+    assert len(lamps) == 2
+    assert index.builds == 1
+
+
+def test_entity_created_behind_the_index():
+    world = World("floor", "monster")
+    index = TagIndex(world)
+    index.build()
+
+    world.create_entity("cabin")
+
+    with pytest.raises(TagIndexError):
+        index.first("cabin")
+
+
+def test_retag():
+    world = World("cabin", "floor")
+    index = TagIndex(world)
+    cabin = index.first("cabin")
+
+    index.retag(cabin, "platform")
+
+    assert cabin.tag == "platform"
+    assert index.first("cabin") is None
+    assert index.first("platform") is cabin
+    assert index.builds == 1
+
+
+def test_tag_changed_behind_the_index():
+    world = World("cabin")
+    index = TagIndex(world)
+    cabin = index.first("cabin")
+
+    cabin.tag = "platform"
+
+    with pytest.raises(TagIndexError):
+        index.first("cabin")
+
+
+def test_tag_check_finds_a_new_tag_behind_the_index(monkeypatch):
+    monkeypatch.setattr(entity_index, "TAG_CHECK", True)
+
+    world = World("cabin", "platform")
+    index = TagIndex(world)
+    cabin = index.first("cabin")
+
+    cabin.tag = "platform"
+
+    with pytest.raises(TagIndexError):
+        index.entities("platform")
+
+
+def test_script_handle_keeps_the_script():
+    class Script(object):
+        pass
+
+    class Owner(object):
+        def __init__(self):
+            self.lookups = 0
+            self.script = Script()
+
+        def get_script(self, name):
+            self.lookups += 1
+            return self.script
+
+    owner = Owner()
+    handle = ScriptHandle("player climb")
+
+    assert handle.get(owner) is owner.script
+    assert handle.get(owner) is owner.script
+    assert owner.lookups == 1
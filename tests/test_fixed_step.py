@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from util_math import Vector2
+from timestep import FixedTimestep
+from fixed_step import FixedStepMover
+
+
+def test_whole_ticks_and_remainder():
+    clock = FixedTimestep(tick_rate=10, max_steps=5)
+
+    clock.advance(0.25)
+
+    assert clock.steps == 2
+    assert clock.accumulator == pytest.approx(0.05)
+    assert clock.alpha == pytest.approx(0.5)
+
+
+def test_remainder_carries_over():
+    clock = FixedTimestep(tick_rate=10, max_steps=5)
+
+    clock.advance(0.06)
+    assert clock.steps == 0
+
+    clock.advance(0.06)
+    assert clock.steps == 1
+    assert clock.accumulator == pytest.approx(0.02)
+
+
+def test_steps_are_clamped():
+    clock = FixedTimestep(tick_rate=10, max_steps=3)
+
+    # a long frame, such as switching worlds
+    clock.advance(1.05)
+
+    assert clock.steps == 3
+    assert clock.accumulator < clock.tick
+    assert clock.alpha == pytest.approx(0.5)
+    assert clock.dropped == pytest.approx(0.7)
+
+
+def test_clamped_time_does_not_pile_up():
+    clock = FixedTimestep(tick_rate=10, max_steps=3)
+
+    clock.advance(2.0)
+    clock.advance(0.1)
+
+    assert clock.steps == 1
+    assert clock.stats()["frames"] == 2
+    assert clock.stats()["steps per frame"] == pytest.approx(2.0)
+
+
+class Slide(FixedStepMover):
+
+    def __init__(self):
+        super(Slide, self).__init__("slide")
+
+    def fixed_update(self, dt):
+        self.position = Vector2(self.position.x + 100 * dt, self.position.y)
+
+
+def mover_on(clock, position):
+    transform = SimpleNamespace(position=position)
+    renderer = SimpleNamespace(pivot=Vector2(8, 8))
+    entity = SimpleNamespace(world=SimpleNamespace(clock=clock), transform=transform, renderer=renderer)
+
+    mover = Slide()
+    mover.entity = entity
+    return mover
+
+
+def test_transform_holds_the_simulated_position():
+    clock = FixedTimestep(tick_rate=10, max_steps=5)
+    mover = mover_on(clock, Vector2(0, 0))
+
+    clock.advance(0.15)
+    mover.update()
+
+    # the entity is simulated one tick ahead, but drawn halfway into the tick
+    entity = mover.entity
+    assert entity.transform.position.x == pytest.approx(10)
+    assert mover.shown[0] == pytest.approx(5)
+    assert entity.renderer.pivot.x == pytest.approx(13)
+    assert entity.renderer.pivot.y == pytest.approx(8)
+
+    # the offset replaces the last one instead of adding up
+    clock.advance(0.1)
+    mover.update()
+
+    assert entity.transform.position.x == pytest.approx(20)
+    assert entity.renderer.pivot.x == pytest.approx(13)
+
+
+def test_moving_the_transform_places_the_entity():
+    clock = FixedTimestep(tick_rate=10, max_steps=5)
+    mover = mover_on(clock, Vector2(0, 0))
+
+    clock.advance(0.15)
+    mover.update()
+
+    mover.entity.transform.position = Vector2(100, 50)
+    clock.advance(0.1)
+    mover.update()
+
+    assert mover.entity.transform.position.x == pytest.approx(110)
+    assert mover.shown == pytest.approx((105, 50))
@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+from level_loader import GridLevel, load_level
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAZE_LEVEL = os.path.join(ROOT, "assets", "levels", "maze.json")
+OLD_LAYOUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "old_maze_layout.json")
+
+
+def old_layout():
+    with open(OLD_LAYOUT) as layout_file:
+        layout = json.load(layout_file)
+
+    numbered = ("levers", "blocked_walls")
+
+    cells = dict()
+    for key, value in layout.items():
+        if key in numbered:
+            cells[key] = dict((int(k), tuple(c)) for k, c in value.items())
+        elif key != "comment":
+            cells[key] = [tuple(c) for c in value]
+
+    return cells
+
+
+# writes the cells of the layout as the rows of a level file
+def layout_rows(layout):
+    cells = dict((c, "#") for c in layout["walls"])
+    for lever_id, c in layout["levers"].items():
+        cells[c] = str(lever_id)
+    for lever_id, c in layout["blocked_walls"].items():
+        cells[c] = chr(ord("a") + lever_id - 1)
+
+    min_col = min(c[0] for c in cells)
+    min_row = min(c[1] for c in cells)
+    max_col = max(c[0] for c in cells)
+    max_row = max(c[1] for c in cells)
+
+    rows = ["".join(cells.get((col, row), ".") for col in range(min_col, max_col + 1))
+            for row in range(min_row, max_row + 1)]
+
+    return (min_col, min_row), rows
+
+
+def assert_same_layout(level, layout):
+    assert sorted(level.walls) == sorted(set(layout["walls"]))
+    assert level.levers == layout["levers"]
+    assert level.blocked_walls == layout["blocked_walls"]
+    assert level.floors == layout["floors"]
+    assert level.vertical_beams == layout["vertical_beams"]
+    assert level.horizontal_beams == layout["horizontal_beams"]
+
+
+def test_maze_file_matches_the_old_layout():
+    assert_same_layout(load_level(MAZE_LEVEL), old_layout())
+
+
+def test_old_layout_round_trip():
+    layout = old_layout()
+    origin, rows = layout_rows(layout)
+
+    level = GridLevel({"cell_size": [56, 100],
+                       "origin": list(origin),
+                       "rows": rows,
+                       "floors": layout["floors"],
+                       "vertical_beams": layout["vertical_beams"],
+                       "horizontal_beams": layout["horizontal_beams"]})
+
+    assert_same_layout(level, layout)
+    assert level.min_cell == origin
+    assert level.max_cell == (origin[0] + len(rows[0]) - 1, origin[1] + len(rows) - 1)
+
+
+def test_unknown_cell():
+    with pytest.raises(ValueError):
+        GridLevel({"cell_size": [1, 1], "origin": [0, 0], "rows": ["#?"]})
+
+
+def test_lever_setting_default():
+    level = load_level(MAZE_LEVEL)
+
+    settings = {"default": 5, "3": 12}
+    assert level.lever_setting(settings, 3) == 12
+    assert level.lever_setting(settings, 4) == 5
+
+
+def test_load_level_parses_again_when_the_file_changes(tmp_path):
+    path = str(tmp_path / "level.json")
+
+    with open(path, "w") as level_file:
+        json.dump({"cell_size": [1, 1], "origin": [0, 0], "rows": ["#."]}, level_file)
+
+    level = load_level(path)
+    assert load_level(path) is level
+
+    with open(path, "w") as level_file:
+        json.dump({"cell_size": [1, 1], "origin": [0, 0], "rows": ["##"]}, level_file)
+    os.utime(path, (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+
+    assert load_level(path).walls == [(0, 0), (1, 0)]
@@ -0,0 +1,111 @@
+from snapshot import capture_initial_state, restore_initial_state
+from world import World
+from components import WorldScript
+from restart import RestartWorld
+
+# (script name, frame) of every script update, kept out of the worlds so it isn't restored
+runs = list()
+
+
+class Engine(object):
+
+    def __init__(self, world):
+        self.world = world
+        self.frame = 0
+        self.game = None
+
+    def set_world(self, world):
+        self.world = world
+        world.engine = self
+        world.load_scene()
+
+    # updates the scripts of the current world, going through its script list while they run
+    def run_frame(self):
+        self.frame += 1
+        for script in self.world.scripts:
+            script.update()
+
+
+class Game(object):
+
+    def __init__(self, engine, main_room):
+        self.engine = engine
+        self.main_room = main_room
+        self.restart_room = RestartWorld()
+        self.restart_room.engine = engine
+        self.restart_pending = False
+
+    def restart(self):
+        self.restart_pending = True
+        self.engine.set_world(self.restart_room)
+
+    def reset_worlds(self):
+        self.restart_pending = False
+        restore_initial_state(self.main_room)
+        self.engine.set_world(self.main_room)
+
+
+class Record(WorldScript):
+
+    def update(self):
+        runs.append((self.script_name, self.world.engine.frame))
+
+
+# adds a script to the world while the engine goes through the scripts
+class Spawn(Record):
+
+    def update(self):
+        super(Spawn, self).update()
+        self.world.add_script(Record("spawned"))
+
+
+# asks for a restart on the first frame
+class Die(Record):
+
+    def update(self):
+        super(Die, self).update()
+        if self.world.engine.frame == 1:
+            self.world.engine.game.restart()
+
+
+class MainRoom(World):
+
+    def load_scene(self):
+        pass
+
+
+def test_restart_from_a_script_waits_for_the_frame_to_end():
+    del runs[:]
+
+    main_room = MainRoom()
+    for script in (Spawn("spawn"), Die("die"), Record("last")):
+        main_room.add_script(script)
+
+    engine = Engine(main_room)
+    main_room.engine = engine
+    engine.game = Game(engine, main_room)
+    capture_initial_state(main_room)
+
+    # the restart is asked for while the main room's scripts are being gone through
+    engine.run_frame()
+    assert runs == [("spawn", 1), ("die", 1), ("last", 1), ("spawned", 1)]
+    assert engine.world is engine.game.restart_room
+    assert len(main_room.scripts) == 4
+
+    # the restart world puts the main room back and returns to it
+    engine.run_frame()
+    assert engine.world is main_room
+    assert not engine.game.restart_pending
+    assert [script.script_name for script in main_room.scripts] == ["spawn", "die", "last"]
+
+    del runs[:]
+    engine.run_frame()
+    assert runs == [("spawn", 3), ("die", 3), ("last", 3), ("spawned", 3)]
+
+
+def test_restart_world_adds_its_script_once():
+    restart_room = RestartWorld()
+    restart_room.load_scene()
+    restart_room.load_scene()
+
+    assert len(restart_room.scripts) == 1
@@ -0,0 +1,16 @@
+from startup import StartupTimer
+
+
+def test_callback_waits_for_every_phase():
+    timer = StartupTimer()
+    reports = list()
+
+    timer.record("load_scene PlatformWorld", 1.0)
+    timer.when_recorded(["load_scene PlatformWorld", "load_scene Maze"], lambda: reports.append(timer.report()))
+    assert reports == []
+
+    timer.record("load_scene Maze", 0.5)
+    timer.record("load_scene Maze", 0.5)
+
+    assert len(reports) == 1
+    assert "load_scene Maze" in reports[0]
@@ -0,0 +1,101 @@
+import pytest
+
+from tile_grid import TileGrid, EMPTY, SOLID, LEVER, BLOCKED
+
+
+def make_grid():
+    return TileGrid(10, 20, (-2, -2), (5, 5))
+
+
+def test_flags_and_entities():
+    grid = make_grid()
+    lever = object()
+
+    grid.set((1, 1), None)
+    grid.set((2, 1), lever, SOLID | LEVER)
+
+    assert grid.flags_at((1, 1)) == SOLID
+    assert grid.flags_at((2, 1)) == SOLID | LEVER
+    assert grid.entity_at((2, 1)) is lever
+    assert grid.flags_at((3, 1)) == EMPTY
+
+    grid.remove((2, 1))
+    assert grid.flags_at((2, 1)) == EMPTY
+    assert grid.entity_at((2, 1)) is None
+
+
+def test_cells_outside_of_the_grid():
+    grid = make_grid()
+
+    assert grid.flags_at((6, 0)) == EMPTY
+    assert grid.entity_at((-3, 0)) is None
+
+    # removing outside of the grid does nothing, setting there is a mistake
+    grid.remove((0, 6))
+    with pytest.raises(IndexError):
+        grid.set((0, 6), None)
+
+
+def test_cells_are_centered_on_their_coordinate():
+    grid = make_grid()
+
+    assert grid.cell_at(0, 0) == (0, 0)
+    assert grid.cell_at(4.9, 9.9) == (0, 0)
+    assert grid.cell_at(5, 10) == (1, 1)
+    assert grid.cell_at(-5.1, -10.1) == (-1, -1)
+    assert grid.cell_bounds((1, -1)) == (5, -30, 15, -10)
+
+
+def test_query_matches_the_mask():
+    grid = make_grid()
+    lever = object()
+    blocked = object()
+
+    grid.set((0, 0), None)
+    grid.set((1, 0), lever, SOLID | LEVER)
+    grid.set((2, 0), blocked, SOLID | BLOCKED)
+
+    found = list(grid.query(-5, -10, 25, 10, LEVER | BLOCKED))
+    assert found == [((1, 0), lever, SOLID | LEVER), ((2, 0), blocked, SOLID | BLOCKED)]
+
+    assert len(list(grid.query(-5, -10, 25, 10))) == 3
+
+
+def test_query_solids_cells():
+    grid = make_grid()
+    grid.set((0, 0), None)
+    grid.set((1, 0), object(), LEVER)
+
+    # the lever cell is touched but not solid
+    assert list(grid.query_solids(-5, -10, 15, 10)) == [(-5, -10, 5, 10)]
+
+
+def test_query_solids_merged_rect_once():
+    grid = make_grid()
+    for cell in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+        grid.set(cell, None)
+    grid.add_rect(0, 0, 2, 2)
+
+    assert list(grid.query_solids(-10, -20, 20, 40)) == [(-5, -10, 15, 30)]
+    assert grid.solid_bounds((1, 1)) == (-5, -10, 15, 30)
+
+
+def test_query_solids_edges_on_cell_borders():
+    grid = make_grid()
+    grid.set((1, 0), None)
+
+    # a box that ends exactly where the cell starts doesn't overlap it
+    assert list(grid.query_solids(-5, -10, 5, 10)) == []
+    assert list(grid.query_solids(-5, -10, 5.5, 10)) == [(5, -10, 15, 10)]
+
+
+def test_merged_rect_outside_of_the_grid():
+    grid = make_grid()
+
+    with pytest.raises(IndexError):
+        grid.add_rect(4, 4, 3, 1)
+
+    with pytest.raises(IndexError):
+        grid.add_rect(-3, 0, 1, 1)
+
+    assert grid.rects == []
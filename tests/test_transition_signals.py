@@ -0,0 +1,84 @@
+from transition_signals import TransitionSignals
+
+
+class Machine(object):
+
+    def __init__(self, state):
+        self.current_state = state
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+
+class Counter(object):
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_only_the_signals_of_the_state_are_sampled():
+    moving = Counter(False)
+    falling = Counter(False)
+
+    signals = TransitionSignals()
+    signals.add("moving", moving)
+    signals.add("falling", falling)
+    signals.read_in("idle", ["moving"])
+
+    signals.update(Machine("idle"))
+    signals.update(Machine("idle"))
+
+    assert moving.calls == 2
+    assert falling.calls == 0
+
+
+def test_state_without_reads_samples_everything():
+    moving = Counter(False)
+
+    signals = TransitionSignals()
+    signals.add("moving", moving)
+
+    signals.update(Machine("walking"))
+
+    assert moving.calls == 1
+
+
+def test_gated_signal_is_sampled_with_its_gate():
+    climbing = Counter(False)
+    on_ladder = Counter(True)
+
+    signals = TransitionSignals()
+    signals.add("climbing", climbing)
+    signals.add("on ladder", on_ladder, when="climbing")
+    signals.read_in("idle", ["on ladder"])
+    machine = Machine("idle")
+
+    signals.update(machine)
+    assert on_ladder.calls == 0
+    assert signals.get("on ladder") is False
+
+    climbing.value = True
+    signals.update(machine)
+    assert on_ladder.calls == 1
+    assert signals.get("on ladder") is True
+
+
+def test_machine_is_updated_on_changes():
+    moving = Counter(False)
+
+    signals = TransitionSignals()
+    signals.add("moving", moving)
+    machine = Machine("idle")
+
+    signals.update(machine)
+    signals.update(machine)
+    moving.value = True
+    signals.update(machine)
+
+    assert machine.updates == 2
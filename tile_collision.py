@@ -0,0 +1,97 @@
+
+# Collisions of an entity with the solid cells of a tile grid, for worlds like the maze whose
+# walls are indexed in a TileGrid instead of being colliders of the physics system.
+
+from asset_cache import frame_io_guard
+from fixed_step import FixedStepMover
+from tile_grid import LEVER, BLOCKED
+
+# how close, in pixels, a box has to be to a cell to count as touching it
+TOUCH_TOLERANCE = 2.0
+
+
+# Keeps the entity out of the solid cells of a tile grid. Instead of the physics system
+# testing the entity against every tile, only the cells around it are checked each tick.
+# Cells whose flags match touch_flags are reported to on_touch(entity) while the entity is
+# in contact with them.
+#
+# The velocity of the entity's rigid body is how it wants to move. The entity is moved by that
+# velocity on the world's clock, and the rigid body is left at rest so that the physics system
+# doesn't move it a second time.
+@frame_io_guard
+class TileGridCollision(FixedStepMover):
+
+    def __init__(self, script_name, grid, on_touch=None, touch_flags=LEVER | BLOCKED):
+        super(TileGridCollision, self).__init__(script_name)
+        self.grid = grid
+        self.on_touch = on_touch
+        self.touch_flags = touch_flags
+
+    def update(self):
+        super(TileGridCollision, self).update()
+        self.entity.rigid_body.velocity.zero()
+
+        # report the special cells we are touching
+        if self.on_touch is not None:
+            half_w = self.entity.collider.box.w / 2.0 + TOUCH_TOLERANCE
+            half_h = self.entity.collider.box.h / 2.0 + TOUCH_TOLERANCE
+            left, top, right, bottom = self.box(half_w, half_h)
+            for cell, entity, flags in list(self.grid.query(left, top, right, bottom, self.touch_flags)):
+                self.on_touch(entity)
+
+    def fixed_update(self, dt):
+        velocity = self.entity.rigid_body.velocity
+
+        half_w = self.entity.collider.box.w / 2.0
+        half_h = self.entity.collider.box.h / 2.0
+
+        # push the entity out of any solid area it ended up in
+        for bounds in list(self.grid.query_solids(*self.box(half_w, half_h))):
+            self.resolve(bounds, half_w, half_h)
+
+        # stop at the edge of the next solid cell instead of moving into it
+        dx = velocity.x * dt
+        if dx != 0:
+            left, top, right, bottom = self.box(half_w, half_h)
+            for c_left, c_top, c_right, c_bottom in self.grid.query_solids(left + dx, top, right + dx, bottom):
+                gap = c_left - right if dx > 0 else c_right - left
+                if abs(gap) < abs(dx):
+                    dx = gap
+            self.position.x += dx
+
+        dy = velocity.y * dt
+        if dy != 0:
+            left, top, right, bottom = self.box(half_w, half_h)
+            for c_left, c_top, c_right, c_bottom in self.grid.query_solids(left, top + dy, right, bottom + dy):
+                gap = c_top - bottom if dy > 0 else c_bottom - top
+                if abs(gap) < abs(dy):
+                    dy = gap
+            self.position.y += dy
+
+    # the simulated box of the entity, as left, top, right and bottom
+    def box(self, half_w, half_h):
+        position = self.position
+        return position.x - half_w, position.y - half_h, position.x + half_w, position.y + half_h
+
+    # move the entity out of the solid area along the axis of least penetration
+    def resolve(self, bounds, half_w, half_h):
+        position = self.position
+        left, top, right, bottom = self.box(half_w, half_h)
+        c_left, c_top, c_right, c_bottom = bounds
+
+        overlap_x = min(right, c_right) - max(left, c_left)
+        overlap_y = min(bottom, c_bottom) - max(top, c_top)
+
+        if overlap_x <= 0 or overlap_y <= 0:
+            return
+
+        if overlap_x < overlap_y:
+            if position.x < (c_left + c_right) / 2.0:
+                position.x -= overlap_x
+            else:
+                position.x += overlap_x
+        else:
+            if position.y < (c_top + c_bottom) / 2.0:
+                position.y -= overlap_y
+            else:
+                position.y += overlap_y
@@ -0,0 +1,133 @@
+
+# An occupancy index for worlds laid out on a fixed grid, such as the maze. Every cell stores the
+# entity placed on it and a set of flags, so finding what is around a position only looks at the
+# few cells it covers instead of testing every tile in the world.
+
+from math import floor
+
+# cell flags
+EMPTY = 0
+SOLID = 1
+LEVER = 2
+BLOCKED = 4
+
+
+class TileGrid(object):
+
+    # min_cell and max_cell are the (column, row) corners of the grid, both inclusive.
+    # The center of a cell is at (column * cell_w, row * cell_h), like find_coordinate in the maze.
+    def __init__(self, cell_w, cell_h, min_cell, max_cell):
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+
+        self.min_col = min_cell[0]
+        self.min_row = min_cell[1]
+        self.cols = max_cell[0] - min_cell[0] + 1
+        self.rows = max_cell[1] - min_cell[1] + 1
+
+        # flat row-major arrays of the entities and their flags
+        self.entities = [None] * (self.cols * self.rows)
+        self.flags = bytearray(self.cols * self.rows)
+
+        # bounds of the rectangles that static solid cells were merged into, and the rectangle
+        # each cell belongs to (-1 for cells that are not part of one)
+        self.rects = list()
+        self.rect_ids = [-1] * (self.cols * self.rows)
+
+    def index(self, cell):
+        col = cell[0] - self.min_col
+        row = cell[1] - self.min_row
+
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+
+        return -1
+
+    def set(self, cell, entity, flags=SOLID):
+        i = self.index(cell)
+        if i < 0:
+            raise IndexError("cell outside of the grid: " + str(cell))
+
+        self.entities[i] = entity
+        self.flags[i] = flags
+
+    def remove(self, cell):
+        i = self.index(cell)
+        if i >= 0:
+            self.entities[i] = None
+            self.flags[i] = EMPTY
+
+    # cells outside of the grid are empty
+    def entity_at(self, cell):
+        i = self.index(cell)
+        return self.entities[i] if i >= 0 else None
+
+    def flags_at(self, cell):
+        i = self.index(cell)
+        return self.flags[i] if i >= 0 else EMPTY
+
+    # the cell containing the world position
+    def cell_at(self, x, y):
+        col = int(floor((x + self.cell_w / 2.0) / self.cell_w))
+        row = int(floor((y + self.cell_h / 2.0) / self.cell_h))
+        return col, row
+
+    # left, top, right, bottom of the cell in world coordinates
+    def cell_bounds(self, cell):
+        left = cell[0] * self.cell_w - self.cell_w / 2.0
+        top = cell[1] * self.cell_h - self.cell_h / 2.0
+        return left, top, left + self.cell_w, top + self.cell_h
+
+    # Marks the cells of a merged rectangle given by its top left cell and size in cells.
+    # Only meant for cells that never change, like the walls of the maze.
+    def add_rect(self, col, row, cols, rows):
+        left = self.cell_bounds((col, row))[0]
+        top = self.cell_bounds((col, row))[1]
+        if self.index((col, row)) < 0 or self.index((col + cols - 1, row + rows - 1)) < 0:
+            raise IndexError("rectangle outside of the grid: " + str((col, row, cols, rows)))
+
+        rect_id = len(self.rects)
+        self.rects.append((left, top, left + cols * self.cell_w, top + rows * self.cell_h))
+
+        for r in range(row, row + rows):
+            for c in range(col, col + cols):
+                self.rect_ids[self.index((c, r))] = rect_id
+
+    # the bounds of the merged rectangle the cell is part of, or of the cell itself
+    def solid_bounds(self, cell):
+        rect_id = self.rect_ids[self.index(cell)]
+        if rect_id >= 0:
+            return self.rects[rect_id]
+        return self.cell_bounds(cell)
+
+    # Yields the bounds of every solid area overlapping the box, each merged rectangle once.
+    def query_solids(self, left, top, right, bottom):
+        seen = set()
+        for cell, entity, flags in self.query(left, top, right, bottom, SOLID):
+            i = self.index(cell)
+            rect_id = self.rect_ids[i]
+
+            if rect_id < 0:
+                yield self.cell_bounds(cell)
+
+            elif rect_id not in seen:
+                seen.add(rect_id)
+                yield self.rects[rect_id]
+
+    # Yields (cell, entity, flags) for the occupied cells overlapping the box given by its
+    # left, top, right and bottom edges whose flags match the mask.
+    def query(self, left, top, right, bottom, mask=0xFF):
+        min_col, min_row = self.cell_at(left, top)
+        max_col, max_row = self.cell_at(right, bottom)
+
+        # edges that lie exactly on a cell border don't overlap the next cell
+        if right == self.cell_bounds((max_col, max_row))[0]:
+            max_col -= 1
+        if bottom == self.cell_bounds((max_col, max_row))[1]:
+            max_row -= 1
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                i = self.index((col, row))
+                if i >= 0 and self.flags[i] & mask:
+                    yield (col, row), self.entities[i], self.flags[i]
@@ -0,0 +1,153 @@
+
+# Large surfaces made of a repeated tile (floors, ceilings) without baking the whole quilt.
+# The tile is kept once and only the tiles inside the camera view are drawn into a window
+# surface about the size of the display, which the entity renders instead of the full image.
+
+from pygame import Surface, Rect, transform
+
+from components import BehaviorScript
+from systems import RenderSystem
+from util_math import Vector2
+from asset_cache import frame_io_guard, surface_bytes
+from utility import blit_all
+
+# color used as the transparent background of the window, same idea as create_img_from_tile
+WINDOW_COLOR_KEY = (7, 13, 17)
+
+
+class TiledSurface(object):
+
+    # The tile is repeated over width x height pixels starting at the top left corner, or from
+    # the bottom left corner when flip_y is set, so that it looks like the vertically flipped
+    # quilt that create_img_from_tile + pygame.transform.flip would give.
+    def __init__(self, tile, width, height, flip_y=False):
+        self.tile = tile
+        self.width = width
+        self.height = height
+        self.flip_y = flip_y
+
+        self.tile_w = tile.get_width()
+        self.tile_h = tile.get_height()
+
+        # local position of the first tile
+        self.start_x = 0
+        self.start_y = 0
+
+        if flip_y:
+            self.tile = transform.flip(tile, False, True)
+
+            rows = (height + self.tile_h - 1) // self.tile_h
+            self.start_y = height - rows * self.tile_h
+
+    # The range of tiles overlapping the local rectangle, as (first col, first row, last col, last row),
+    # or None if the rectangle is outside of the surface.
+    def tile_range(self, left, top, right, bottom):
+        left = max(left, 0)
+        top = max(top, 0)
+        right = min(right, self.width)
+        bottom = min(bottom, self.height)
+
+        if left >= right or top >= bottom:
+            return None
+
+        first_col = (left - self.start_x) // self.tile_w
+        first_row = (top - self.start_y) // self.tile_h
+        last_col = (right - 1 - self.start_x) // self.tile_w
+        last_row = (bottom - 1 - self.start_y) // self.tile_h
+
+        return int(first_col), int(first_row), int(last_col), int(last_row)
+
+    # Draws the tiles of the range into the window. Returns the local position of the window's
+    # top left corner, which is kept inside of the surface.
+    def draw_range(self, window, tile_range):
+        first_col, first_row, last_col, last_row = tile_range
+
+        origin_x = max(self.start_x + first_col * self.tile_w, 0)
+        origin_y = max(self.start_y + first_row * self.tile_h, 0)
+
+        window.set_clip(None)
+        window.fill(WINDOW_COLOR_KEY)
+
+        # don't draw the parts of the tiles that fall outside of the surface
+        window.set_clip(Rect(-origin_x, -origin_y, self.width, self.height))
+
+        blits = list()
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                x = self.start_x + col * self.tile_w - origin_x
+                y = self.start_y + row * self.tile_h - origin_y
+                blits.append((self.tile, (x, y)))
+
+        blit_all(window, blits)
+        window.set_clip(None)
+
+        return origin_x, origin_y
+
+    # a window large enough for any tile range visible in a view of the given size
+    def create_window(self, view_w, view_h):
+        size = (min(self.width, view_w + self.tile_w), min(self.height, view_h + self.tile_h))
+        window = Surface(size).convert()
+        window.fill(WINDOW_COLOR_KEY)
+        window.set_colorkey(WINDOW_COLOR_KEY)
+        return window
+
+    # the memory the quilt would use if baked, in bytes
+    def baked_bytes(self):
+        return self.width * self.height * self.tile.get_bytesize()
+
+
+# Compares the memory of the tiled surfaces with baking each of them. Shared tiles are only
+# counted once.
+def memory_report(tiled_renderers):
+    baked = 0
+    tiled = 0
+    tiles = dict()
+
+    for renderer in tiled_renderers:
+        baked += renderer.tiled.baked_bytes()
+        tiled += surface_bytes(renderer.window)
+        tiles[id(renderer.tiled.tile)] = surface_bytes(renderer.tiled.tile)
+
+    tiled += sum(tiles.values())
+
+    return {"baked_bytes": baked, "tiled_bytes": tiled, "saved_bytes": baked - tiled}
+
+
+# Renders a tiled surface centered on the entity. Every frame the tiles inside the camera view
+# are found and, only if they changed, drawn into the window that the entity's renderer shows.
+@frame_io_guard
+class TiledRenderer(BehaviorScript):
+
+    def __init__(self, script_name, tiled, window):
+        super(TiledRenderer, self).__init__(script_name)
+        self.tiled = tiled
+        self.window = window
+        self.drawn_range = None
+
+    def update(self):
+        world = self.entity.world
+
+        # looked up every frame, headless runs remove the render system once the world is loaded
+        render = world.get_system(RenderSystem.tag)
+
+        if render is None or render.camera is None:
+            return
+
+        display = world.engine.display
+        camera_pos = render.camera.transform.position
+        position = self.entity.transform.position
+
+        # camera view in the local coordinates of the tiled surface
+        left = int(camera_pos.x - (position.x - self.tiled.width / 2.0))
+        top = int(camera_pos.y - (position.y - self.tiled.height / 2.0))
+
+        tile_range = self.tiled.tile_range(left, top, left + display.get_width(), top + display.get_height())
+
+        if tile_range is None or tile_range == self.drawn_range:
+            return
+
+        origin_x, origin_y = self.tiled.draw_range(self.window, tile_range)
+        self.drawn_range = tile_range
+
+        # the renderer draws the window at position - pivot
+        self.entity.renderer.pivot = Vector2(self.tiled.width / 2.0 - origin_x, self.tiled.height / 2.0 - origin_y)
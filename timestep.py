@@ -0,0 +1,68 @@
+
+# The clock of the script driven movement. Each frame the world's clock turns the frame time into
+# a whole number of fixed ticks, capped so that a slow frame (such as a world switch) can't produce
+# one huge step that carries an entity through a floor. The ticks are run by the movers in
+# fixed_step.
+
+TICK_RATE = 60
+MAX_STEPS = 5
+
+# seconds every frame is taken to last instead of the engine's delta time, see use_synthetic_clock
+_synthetic_frame_time = None
+
+
+# Makes every frame last the given number of seconds for the world clocks, so the simulation
+# doesn't depend on how fast the frames really are. None goes back to the engine's delta time.
+def use_synthetic_clock(frame_time):
+    global _synthetic_frame_time
+    _synthetic_frame_time = frame_time
+
+
+# the length of the current frame of the world, in seconds
+def frame_time(world):
+    if _synthetic_frame_time is not None:
+        return _synthetic_frame_time
+    return world.engine.delta_time
+
+
+class FixedTimestep(object):
+
+    def __init__(self, tick_rate=TICK_RATE, max_steps=MAX_STEPS):
+        self.tick = 1.0 / tick_rate
+        self.max_steps = max_steps
+
+        # time not simulated yet, ticks to run this frame and how far into the next tick we are
+        self.accumulator = 0.0
+        self.steps = 0
+        self.alpha = 0.0
+
+        self.frames = 0
+        self.total_steps = 0
+        self.dropped = 0.0
+
+    def advance(self, dt):
+        self.accumulator += dt
+
+        steps = int(self.accumulator / self.tick)
+        if steps > self.max_steps:
+            steps = self.max_steps
+
+        self.accumulator -= steps * self.tick
+
+        # time beyond the cap is dropped, the world slows down instead of stepping too far
+        if self.accumulator >= self.tick:
+            leftover = self.accumulator % self.tick
+            self.dropped += self.accumulator - leftover
+            self.accumulator = leftover
+
+        self.steps = steps
+        self.alpha = self.accumulator / self.tick
+
+        self.frames += 1
+        self.total_steps += steps
+
+    def stats(self):
+        frames = max(self.frames, 1)
+        return {"frames": self.frames,
+                "steps per frame": self.total_steps / float(frames),
+                "dropped seconds": self.dropped}
@@ -0,0 +1,99 @@
+
+# Change driven updates of a state machine. The transitions read their conditions from a set of
+# named signals (grounded, moving, ...) instead of each condition looking things up for itself.
+# The signals are sampled once per frame, and the state machine is only updated when one of them
+# changed, or when the last update changed the state, since the new state's transitions may
+# already be satisfied by the same signals.
+#
+# Only the signals read by the transitions out of the current state are sampled, as declared with
+# read_in(); a state without declared reads samples every signal. A signal can also be given
+# another signal it only matters with: while that one is false, it reads as false without being
+# sampled.
+
+from collections import OrderedDict
+
+
+class TransitionSignals(object):
+
+    def __init__(self):
+
+        # functions giving the value of each signal, and the values sampled this frame
+        self.sources = OrderedDict()
+        self.values = dict()
+
+        # the signal each signal is only sampled with, and the signals read in each state
+        self.gates = dict()
+        self.state_reads = dict()
+
+        # the state machine is updated on the first frame
+        self.pending = True
+
+        self.frames = 0
+        self.evaluations = 0
+        self.reads = 0
+        self.samples = 0
+
+    # when is the name of an earlier added signal that this one only matters with, see the top
+    # of the module
+    def add(self, name, source, when=None):
+        self.sources[name] = source
+        if when is not None:
+            self.gates[name] = when
+
+    # declares signals read by the transitions out of the state, can be called again for more
+    def read_in(self, state, names):
+        read = self.state_reads.setdefault(state, list())
+        for name in names:
+            gate = self.gates.get(name)
+            if gate is not None and gate not in read:
+                read.append(gate)
+            if name not in read:
+                read.append(name)
+
+    def get(self, name):
+        self.reads += 1
+        return self.values[name]
+
+    # a transition condition that holds while the signal has the expected value
+    def condition(self, name, expected=True):
+        return lambda: self.get(name) == expected
+
+    # samples the signals read in the state, returns whether any of them changed
+    def sample(self, state=None):
+        changed = False
+        for name in self.state_reads.get(state, self.sources):
+            gate = self.gates.get(name)
+            if gate is not None and not self.values[gate]:
+                value = False
+            else:
+                value = self.sources[name]()
+                self.samples += 1
+
+            if name not in self.values or self.values[name] != value:
+                self.values[name] = value
+                changed = True
+
+        return changed
+
+    # Updates the state machine if the signals changed since it was last updated.
+    # Returns whether it was updated.
+    def update(self, machine):
+        self.frames += 1
+
+        state = machine.current_state
+        if not self.sample(state) and not self.pending:
+            return False
+
+        machine.update()
+        self.evaluations += 1
+
+        self.pending = machine.current_state is not state
+        return True
+
+    def stats(self):
+        frames = max(self.frames, 1)
+        return {"frames": self.frames,
+                "evaluations": self.evaluations,
+                "evaluations per frame": self.evaluations / float(frames),
+                "condition reads per frame": self.reads / float(frames),
+                "samples per frame": self.samples / float(frames)}
@@ -6,10 +6,12 @@ from components import Animator
 from util_math import Vector2
 from os import listdir
 from re import split
-from pygame import Surface
-from pygame import image
+from pygame import Surface, transform
 from components import RigidBody
 from components import BoxCollider
+from asset_cache import load_image
+from atlas import atlas_frames
+from collision_routing import set_collision_category, GROUND, CRATE, LIGHT
 
 
 def set_lamp_light_attributes(lamp_light, rs):
@@ -17,6 +19,7 @@ def set_lamp_light_attributes(lamp_light, rs):
     lamp_light.add_component(BoxCollider(50, 50))
     lamp_light.collider.is_trigger = True
     lamp_light.tag = "lamp light"
+    set_collision_category(lamp_light.collider, LIGHT)
     rs.light_sources.append(lamp_light)
 
 
@@ -25,18 +28,21 @@ def set_floor_attributes(floor):
     floor.collider.surface_friction = 0.75
     floor.renderer.depth = -10
     floor.tag = "floor"
+    set_collision_category(floor.collider, GROUND)
 
 
 def set_wall_attributes(wall):
     wall.collider.restitution = 0
     wall.collider.surface_friction = 0.8
     wall.tag = "wall"
+    set_collision_category(wall.collider, GROUND)
 
 
 def set_ceiling_attributes(ceiling):
     ceiling.collider.restitution = 0
     ceiling.collider.surface_friction = 0.8
     ceiling.tag = "ceiling"
+    set_collision_category(ceiling.collider, GROUND)
 
 
 def set_platform_attributes(platform):
@@ -44,6 +50,7 @@ def set_platform_attributes(platform):
     platform.collider.restitution = 0
     platform.collider.surface_friction = 0.75
     platform.tag = "platform"
+    set_collision_category(platform.collider, GROUND)
 
 
 def set_box_attributes(box):
@@ -57,6 +64,7 @@ def set_box_attributes(box):
     box.rigid_body.velocity = Vector2(0.0, 0.0)
     box.rigid_body.gravity_scale = 2.0
     box.tag = "box"
+    set_collision_category(box.collider, CRATE)
 
 
 def get_files_in_dir(dir_path):
@@ -78,19 +86,33 @@ def get_files_in_dir(dir_path):
 
 # This goes to a directory where each file represents an individual
 # animation frame. This returns an animation object with the loaded frames.
+# If the directory was packed into the animation atlas, the frames are taken
+# from there instead of decoding every file.
 def load_anim_from_directory(dir_path):
 
-    file_list = get_files_in_dir(dir_path)
+    frames = atlas_frames(dir_path)
+
+    if frames is None:
+        frames = [load_image(file_) for file_ in get_files_in_dir(dir_path)]
 
     # set up animation
     animation = Animator.Animation()
-    for file_ in file_list:
-        frame = image.load(file_).convert_alpha()
+    for frame in frames:
         animation.add_frame(frame)
 
     return animation
 
 
+# blit a sequence of (surface, position) pairs onto the destination surface, in a single call
+# when pygame supports it
+def blit_all(dst_surface, blits):
+    if hasattr(dst_surface, "blits"):
+        dst_surface.blits(blits, doreturn=False)
+    else:
+        for src_surface, position in blits:
+            dst_surface.blit(src_surface, position)
+
+
 # Excerpt from stack overflow, Mark Byers
 def natural_sort(l):
     convert = lambda text: int(text) if text.isdigit() else text.lower()
@@ -98,9 +120,20 @@ def natural_sort(l):
     return sorted(l, key=alphanum_key)
 
 
+# quilts and conjoined surfaces that were already built, keyed by the ids of their source
+# surfaces. The sources are kept in the values so that the ids stay valid.
+_quilts = dict()
+_conjoined = dict()
+
+
 # given a tile image, this function will create a quilt of tiles onto a another surface
-# given the width and height.
-def create_img_from_tile(tile_surface, width, height):
+# given the width and height. The quilt is flipped vertically if flip is set.
+# Quilts are built once per (tile, width, height, flip) and shared, so don't draw onto them.
+def create_img_from_tile(tile_surface, width, height, flip=False):
+
+    key = (id(tile_surface), width, height, flip)
+    if key in _quilts:
+        return _quilts[key][1]
 
     tile_w = tile_surface.get_width()
     tile_h = tile_surface.get_height()
@@ -115,15 +148,24 @@ def create_img_from_tile(tile_surface, width, height):
 
     # fill the dst_surface horizontally first with the tile, once we get to the edge
     # go down a column and repeat.
-    for y in range(0, height, tile_h):
-        for x in range(0, width, tile_w):
-            dst_surface.blit(tile_surface, (x, y))
+    blits = [(tile_surface, (x, y)) for y in range(0, height, tile_h) for x in range(0, width, tile_w)]
+    blit_all(dst_surface, blits)
+
+    if flip:
+        dst_surface = transform.flip(dst_surface, False, True)
 
+    _quilts[key] = (tile_surface, dst_surface)
     return dst_surface
 
 
 # conjoins surface b on the bottom of surface a
+# The result is shared between calls with the same surfaces, so don't draw onto it.
 def conjoin_surfaces_vertically(surface_a, surface_b):
+
+    key = (id(surface_a), id(surface_b))
+    if key in _conjoined:
+        return _conjoined[key][2]
+
     width = max(surface_a.get_width(), surface_b.get_width())
     height = surface_a.get_height() + surface_b.get_height()
 
@@ -139,7 +181,7 @@ def conjoin_surfaces_vertically(surface_a, surface_b):
     center_a = width/2 - surface_a.get_width()/2
     center_b = width/2 - surface_b.get_width()/2
 
-    dst_surface.blit(surface_a, (center_a, 0))
-    dst_surface.blit(surface_b, (center_b, surface_a.get_height()))
+    blit_all(dst_surface, [(surface_a, (center_a, 0)), (surface_b, (center_b, surface_a.get_height()))])
 
+    _conjoined[key] = (surface_a, surface_b, dst_surface)
     return dst_surface
@@ -0,0 +1,113 @@
+
+# Darkness around the player that only leaves a circle of vision, built in code instead of from a
+# screen sized alpha image. Only the square around the circle is alpha blended; the rest of the
+# view is covered with plain black rectangles, which are copied instead of blended.
+#
+# The gradient is drawn as rings on a small surface and scaled up, once per radius.
+
+from math import ceil
+
+import pygame
+from pygame import Surface, transform, draw
+
+from components import Transform, Renderer
+from util_math import Vector2
+
+# alpha at the center of the circle, and radius at which the darkness is complete
+CENTER_ALPHA = 36
+DEFAULT_RADIUS = 360
+
+# the gradient is drawn this many times smaller than it is shown
+GRADIENT_SCALE = 4
+
+# gradients by (radius, center alpha)
+_gradients = dict()
+
+
+def radial_gradient(radius, center_alpha=CENTER_ALPHA):
+    key = (radius, center_alpha)
+
+    gradient = _gradients.get(key)
+    if gradient is None:
+        small_radius = int(ceil(radius / float(GRADIENT_SCALE)))
+
+        small = Surface((small_radius * 2, small_radius * 2), pygame.SRCALPHA, 32)
+        small.fill((0, 0, 0, 255))
+
+        # from the outside in, the darkness falls off linearly towards the center
+        for r in range(small_radius, 0, -1):
+            alpha = center_alpha + (255 - center_alpha) * r / float(small_radius)
+            draw.circle(small, (0, 0, 0, int(alpha)), (small_radius, small_radius), r)
+
+        gradient = transform.smoothscale(small, (radius * 2, radius * 2))
+        _gradients[key] = gradient
+
+    return gradient
+
+
+class VisionMask(object):
+
+    def __init__(self, world, view_w, view_h, radius=DEFAULT_RADIUS, depth=-100):
+        self.view_w = view_w
+        self.view_h = view_h
+        self.radius = radius
+
+        # the rectangles are pieces of one black surface the size of the view
+        self.black = Surface((view_w, view_h)).convert()
+        self.black.fill((0, 0, 0))
+
+        gradient = radial_gradient(radius)
+        self.circle = self.create_piece(world, gradient, Vector2(radius, radius), depth)
+        self.rects = [self.create_piece(world, self.black.subsurface((0, 0, 0, 0)), Vector2(0, 0), depth)
+                      for i in range(4)]
+
+        # pixels that were blended and copied in the last update
+        self.blended = 0
+        self.copied = 0
+
+    @staticmethod
+    def create_piece(world, image, pivot, depth):
+        piece = world.create_entity()
+        piece.add_component(Transform(Vector2(0, 0)))
+        piece.add_component(Renderer(image, pivot))
+        piece.renderer.depth = depth
+        return piece
+
+    def set_radius(self, radius):
+        if radius != self.radius:
+            self.radius = radius
+            self.circle.renderer.sprite = radial_gradient(radius)
+            self.circle.renderer.pivot = Vector2(radius, radius)
+
+    # centers the circle on the position and covers the rest of the view seen from the camera position
+    def follow(self, position, camera):
+        x = int(position.x)
+        y = int(position.y)
+        r = self.radius
+
+        self.circle.transform.position = Vector2(x, y)
+
+        left = int(camera.x)
+        top = int(camera.y)
+        right = left + self.view_w
+        bottom = top + self.view_h
+
+        # the circle's square, clipped to the view
+        c_left = min(max(x - r, left), right)
+        c_top = min(max(y - r, top), bottom)
+        c_right = min(max(x + r, left), right)
+        c_bottom = min(max(y + r, top), bottom)
+
+        # above, below, left and right of the square
+        pieces = [(left, top, right - left, c_top - top),
+                  (left, c_bottom, right - left, bottom - c_bottom),
+                  (left, c_top, c_left - left, c_bottom - c_top),
+                  (c_right, c_top, right - c_right, c_bottom - c_top)]
+
+        self.copied = 0
+        for piece, (p_left, p_top, w, h) in zip(self.rects, pieces):
+            piece.renderer.sprite = self.black.subsurface((0, 0, w, h))
+            piece.transform.position = Vector2(p_left, p_top)
+            self.copied += w * h
+
+        self.blended = (c_right - c_left) * (c_bottom - c_top)